@@ -297,6 +297,7 @@ class AchievementGallery:
 
     def _get_milestones(self):
         """獲取里程碑"""
+        assets = self.game.data.total_assets()
         milestones = [
             {
                 'name': '初入社會',
@@ -306,15 +307,15 @@ class AchievementGallery:
             },
             {
                 'name': '小有積蓄',
-                'achieved': self.game.data.total_assets() >= 10000,
+                'achieved': assets >= 10000,
                 'description': '資產達$10,000',
-                'remaining': f"${max(0, 10000 - self.game.data.total_assets()):.0f}"
+                'remaining': f"${max(0, 10000 - assets):.0f}"
             },
             {
                 'name': '百萬富翁',
-                'achieved': self.game.data.total_assets() >= 1000000,
+                'achieved': assets >= 1000000,
                 'description': '資產達$1,000,000',
-                'remaining': f"${max(0, 1000000 - self.game.data.total_assets()):.0f}"
+                'remaining': f"${max(0, 1000000 - assets):.0f}"
             },
             {
                 'name': '全能發展',
@@ -9,6 +9,7 @@ from leaderboard import Leaderboard
 import tkinter as tk
 from tkinter import messagebox
 from datetime import datetime
+from collections.abc import Mapping
 import time
 import random
 import os
@@ -297,47 +298,10 @@ class BankGame:
         return self.store.cancel_subscription_from_ui()
 
     def _init_consumables(self):
-        """初始化消耗品數據"""
-        if not hasattr(self.data, 'consumables') or not isinstance(self.data.consumables, dict):
-            self.data.consumables = {
-                'energy_drink': {
-                    'name': '能量飲料',
-                    'price': 50.0,
-                    'daily_limit': 3,
-                    'daily_bought': 0,
-                    'description': '恢復體力，讓你更有活力',
-                    'restore': {'energy': 30},
-                    'important': True
-                },
-                'study_kit': {
-                    'name': '學習包',
-                    'price': 100.0,
-                    'daily_limit': 2,
-                    'daily_bought': 0,
-                    'description': '提升學習效率',
-                    'buffs': [
-                        {'stat': 'intelligence', 'amount': 5, 'duration': 1},
-                        {'stat': 'diligence', 'amount': 5, 'duration': 1}
-                    ]
-                },
-                'social_card': {
-                    'name': '社交卡',
-                    'price': 80.0,
-                    'daily_limit': 2,
-                    'daily_bought': 0,
-                    'description': '提升社交能力',
-                    'buffs': [
-                        {'stat': 'charisma', 'amount': 8, 'duration': 1},
-                        {'stat': 'happiness', 'amount': 5, 'duration': 1}
-                    ]
-                }
-            }
-            
-        # 確保所有消耗品都有必要的欄位
-        for item_id, item in self.data.consumables.items():
-            item.setdefault('daily_bought', 0)
-            item.setdefault('daily_limit', 1)
-            item.setdefault('important', False)
+        """確保每種消耗品都有每日購買計數（消耗品定義由 GameData 以唯讀目錄提供）"""
+        state = self.data.consumable_state
+        for item_id in self.data.consumables:
+            state.setdefault(item_id, {'daily_bought': 0})
     
     def buy_store_good(self, name, price):
         return self.store.buy_store_good(name, price)
@@ -354,7 +318,7 @@ class BankGame:
         """
         try:
             # 檢查物品是否存在於庫存
-            if item_id not in self.data.inventory or self.data.inventory[item_id] <= 0:
+            if not self.data.has_item(item_id):
                 return False, f"沒有可用的 {item_id}"
                 
             # 檢查是否為有效的消耗品
@@ -392,14 +356,11 @@ class BankGame:
                         message += f"\n{stat} 提升了 {amount} 點，持續 {duration} 天"
             
             # 從庫存中移除物品
-            self.data.inventory[item_id] -= 1
-            if self.data.inventory[item_id] <= 0:
-                del self.data.inventory[item_id]
+            self.data.remove_item(item_id)
             
             # 更新UI和存檔
             self.update_display()
-            self._pending_save = True
-            self.schedule_persist()
+            self.request_save()
             
             return True, message
             
@@ -516,23 +477,16 @@ class BankGame:
         # 將頻繁 I/O 轉為延遲合併寫入
         if hasattr(self, 'username') and self.username:
             self._pending_leaderboard = True
-        if hasattr(self, 'savefile'):
-            self._pending_save = True
-        self.schedule_persist()
+        self.request_save()
 
     # --- 活動（每日上限與冷卻）---
     def _ensure_activity_structs(self):
         try:
             rules = getattr(self.data, 'activity_rules', None)
             state = getattr(self.data, 'activity_state', None)
-            if not isinstance(rules, dict):
-                self.data.activity_rules = {
-                    'study': {'daily_max': 3, 'cooldown_days': 1},
-                    'workout': {'daily_max': 3, 'cooldown_days': 1},
-                    'social': {'daily_max': 3, 'cooldown_days': 1},
-                    'meditate': {'daily_max': 3, 'cooldown_days': 1},
-                }
-                rules = self.data.activity_rules
+            if not rules or not isinstance(rules, Mapping):
+                # 存檔帶回的值無效（空值或被序列化成字串）時移除，改回類別上的共用規則
+                vars(self.data).pop('activity_rules', None)
             if not isinstance(state, dict):
                 state = {}
             for k, rule in self.data.activity_rules.items():
@@ -708,16 +662,13 @@ class BankGame:
                                                 old_price = stock['price']
                                                 new_price = float(server_prices[code])
 
-                                                # 總是更新價格，即使沒有變化（確保同步）
-                                                stock['price'] = new_price
-
-                                                # 只在價格有顯著變化時更新歷史記錄
+                                                # 只在價格有顯著變化時更新歷史記錄（長度上限由 record_price 控制）
                                                 if abs(new_price - old_price) > 0.001:
-                                                    stock['history'].append(new_price)
-                                                    # 限制歷史記錄長度，避免記憶體溢出
-                                                    if len(stock['history']) > 1000:
-                                                        stock['history'] = stock['history'][-500:]
+                                                    self.data.record_price(stock, new_price)
                                                     history_updated += 1
+                                                else:
+                                                    # 總是更新價格，即使沒有變化（確保同步）
+                                                    stock['price'] = new_price
 
                                                 updated_count += 1
 
@@ -771,13 +722,13 @@ class BankGame:
                             self.debug_log(f"詳細錯誤: {traceback.format_exc()}")
                             server_error_logged = True
                 if not used_server:
-                    # 本地隨機走動回退
+                    # 本地隨機走動回退：波動率與方法查找在迴圈外做一次
+                    sigma = self.data.market_volatility * self.data.get_difficulty_multiplier('stock_volatility')
+                    gauss = random.gauss
+                    record_price = self.data.record_price
                     for stock in self.data.stocks.values():
-                        change_percent = random.gauss(0, self.data.market_volatility * self.data.get_difficulty_multiplier('stock_volatility'))
-                        new_price = stock['price'] * (1 + change_percent)
-                        new_price = max(10, round(new_price, 2))
-                        stock['price'] = new_price
-                        stock['history'].append(new_price)
+                        new_price = max(10, round(stock['price'] * (1 + gauss(0, sigma)), 2))
+                        record_price(stock, new_price)
                 # 股票更新後，同步更新基金 NAV
                 self.compute_fund_navs()
                 self.schedule_ui_update()
@@ -800,10 +751,7 @@ class BankGame:
                     today = self.data.days + 1
                     
                     # 重置消耗品每日購買計數
-                    if hasattr(self.data, 'consumables'):
-                        for item_id, item in self.data.consumables.items():
-                            if 'daily_bought' in item:
-                                item['daily_bought'] = 0
+                    self.data.reset_daily_purchases()
                     
                     # 生成今日運氣（受魅力微幅影響）
                     if int(getattr(self.data, 'last_luck_day', -1)) != today:
@@ -862,7 +810,7 @@ class BankGame:
                         net = round(gross - tax, 2)
                         if net > 0:
                             self.data.cash += net
-                            self.data.income_history.append({
+                            self.data.record_log('income_history', {
                                 'day': self.data.days + 1,
                                 'type': 'salary',
                                 'gross': gross,
@@ -892,17 +840,20 @@ class BankGame:
                             except Exception:
                                 pass
                             # 安排保存
-                            self._pending_save = True
+                            self.request_save()
                 except Exception as e:
                     self.debug_log(f"study finalize error: {e}")
                 # 支出：到期扣款
                 try:
-                    freq_days = {'daily': 1, 'weekly': 7, 'monthly': 30}
+                    freq_days = StoreExpensesManager.FREQ_DAYS
+                    sub_effects = StoreExpensesManager.SUBSCRIPTION_EFFECTS
                     today = self.data.days + 1
-                    for exp in list(getattr(self.data, 'expenses', [])):
+                    # 難度倍率當日固定，迴圈外取一次
+                    expense_mult = self.data.get_difficulty_multiplier('expense_multiplier')
+                    for exp in getattr(self.data, 'expenses', []):
                         due = int(exp.get('next_due_day', today))
                         if due <= today:
-                            amount = float(exp.get('amount', 0.0)) * self.data.get_difficulty_multiplier('expense_multiplier')
+                            amount = float(exp.get('amount', 0.0)) * expense_mult
                             paid = 0.0
                             # 先扣現金，再扣存款
                             if self.data.cash >= amount:
@@ -919,18 +870,13 @@ class BankGame:
                                     # 存款也不足，只能扣到 0，留下未付不累積負債（MVP 簡化）
                                     paid += self.data.balance
                                     self.data.balance = 0
-                            self.data.expense_history.append({'day': today, 'name': exp.get('name','支出'), 'amount': paid})
+                            self.data.record_log('expense_history', {'day': today, 'name': exp.get('name','支出'), 'amount': paid})
                             self.log_transaction(f"支出扣款：{exp.get('name','支出')} ${paid:.2f}")
                             # 訂閱影響：僅在成功全額扣款時生效
                             try:
                                 name = str(exp.get('name', ''))
                                 if paid >= amount and amount > 0:
-                                    effects = {
-                                        'Netflix 訂閱': {'happiness': 3},
-                                        'Spotify 訂閱': {'happiness': 2},
-                                        '健身房會員': {'stamina': 4, 'happiness': 1},
-                                    }
-                                    eff = effects.get(name)
+                                    eff = sub_effects.get(name)
                                     if eff is not None:
                                         if 'happiness' in eff:
                                             self.data.happiness = self._clamp_attr(self.data.happiness + eff['happiness'])
@@ -1464,31 +1410,20 @@ class BankGame:
         try:
             if not hasattr(self.data, 'funds_catalog') or not hasattr(self.data, 'funds'):
                 return
-            for fname, finfo in self.data.funds_catalog.items():
+            stocks = self.data.stocks
+            for fname, (codes, coefs) in self.data.fund_vectors.items():
                 f = self.data.funds.get(fname)
                 if not isinstance(f, dict):
                     continue
-                base_prices = f.get('base_prices') or {}
-                value_sum = 0.0
-                weight_sum = 0.0
-                for code, w in finfo.get('weights', {}).items():
-                    stock = self.data.stocks.get(code)
-                    if not stock:
-                        continue
-                    price = float(stock.get('price', 0.0))
-                    base = float(base_prices.get(code, 0.0))
-                    if base <= 0:
-                        base = price if price > 0 else 1.0
-                        f.setdefault('base_prices', {})[code] = base
-                    value_sum += w * (price / base)
-                    weight_sum += w
-                if weight_sum <= 0:
+                if not codes:
                     nav = f.get('nav', 100.0)
                 else:
-                    nav = 100.0 * value_sum  # 權重和視為 1
-                f['nav'] = round(nav, 4)
+                    # 係數已含權重與基準價（權重和視為 1）
+                    nav = 100.0 * sum(c * stocks[code]['price'] for code, c in zip(codes, coefs))
                 if record_history:
-                    f.setdefault('history', []).append(f['nav'])
+                    self.data.record_fund_nav(f, round(nav, 4))
+                else:
+                    f['nav'] = round(nav, 4)
         except Exception as e:
             self.debug_log(f"compute_fund_navs error: {e}")
 
@@ -1677,9 +1612,9 @@ class BankGame:
                     self.debug_log(f"after_cancel name={key} id={aid}")
                 except Exception:
                     pass
-        # 關閉前最後一次同步持久化，避免待寫入資料遺失
+        # 關閉前最後一次同步持久化並確實寫入磁碟，避免待寫入資料遺失
         try:
-            self.persist_state()
+            self.persist_state(durable=True)
         except Exception:
             pass
         self.root.destroy()
@@ -1744,7 +1679,13 @@ class BankGame:
         self._persist_scheduled = True
         self.debug_log(f"schedule persist after {delay_ms} ms -> id={aid}")
 
-    def persist_state(self):
+    def request_save(self):
+        """標記有資料待存檔；已有排程時直接併入，不重設計時，避免頻繁觸發時一直延後寫入"""
+        self._pending_save = True
+        if not getattr(self, '_persist_scheduled', False):
+            self.schedule_persist()
+
+    def persist_state(self, durable=False):
         t0 = time.perf_counter()
         try:
             did_rank = False
@@ -1753,7 +1694,7 @@ class BankGame:
                 self.leaderboard.add_record(self.username, self.data.total_assets(), self.data.days)
                 did_rank = True
             if self._pending_save and hasattr(self, 'savefile'):
-                self.data.save(self.savefile, show_error=lambda msg: messagebox.showerror("存檔錯誤", msg))
+                self.data.save(self.savefile, show_error=lambda msg: messagebox.showerror("存檔錯誤", msg), durable=durable)
                 did_save = True
         finally:
             dt = (time.perf_counter() - t0) * 1000
@@ -1765,6 +1706,6 @@ class BankGame:
         if self.data.cash <= 0 and self.data.balance <= 0 and self.data.loan > 0:
             # 只重置帳號資料，不更換帳號名稱
             self.data.reset(is_reborn=True)
-            self.data.save(self.savefile)
+            self.request_save()
             messagebox.showinfo("破產重生", f"你已破產，已自動重生！\n現金 $1000，存款 $0，貸款 $0\n重生次數：{self.data.reborn_count}")
             self.update_display() 
\ No newline at end of file
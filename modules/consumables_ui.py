@@ -71,7 +71,7 @@ class ConsumablesUI:
             ttk.Label(frame, text=item['name'], width=15).pack(side='left')
             ttk.Label(frame, text=f"${item['price']}", width=8).pack(side='left')
             
-            daily_left = max(0, item['daily_limit'] - item['daily_bought'])
+            daily_left = max(0, item['daily_limit'] - self.game.data.get_daily_bought(item_id))
             ttk.Button(
                 frame, 
                 text=f"購買 ({daily_left}/{item['daily_limit']})",
@@ -154,7 +154,7 @@ class ConsumablesUI:
         price = item.get('price', 0)
         
         # 檢查每日限購
-        if item.get('daily_bought', 0) >= item.get('daily_limit', 1):
+        if self.game.data.get_daily_bought(item_id) >= item.get('daily_limit', 1):
             messagebox.showerror("購買失敗", f"{item_name} 今日已達限購數量")
             return
             
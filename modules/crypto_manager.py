@@ -120,8 +120,8 @@ class CryptoManager:
                 return
             # 價格隨機波動
             btc_change = random.gauss(0, BTC_VOLATILITY)
-            btc['price'] = max(BTC_MIN_PRICE, round(btc['price'] * (1 + btc_change)))
-            btc.setdefault('history', []).append(btc['price'])
+            # 經由 record_price 寫入，價格歷史與其他股票一樣維持有界
+            self.game.data.record_price(btc, max(BTC_MIN_PRICE, round(btc['price'] * (1 + btc_change))))
             # 自動產出比特幣
             hashrate = getattr(self.game.data, 'btc_hashrate', 0)
             if hashrate > 0:
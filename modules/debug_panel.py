@@ -303,21 +303,22 @@ class DebugPanel:
         elif "財務資訊" in item_text:
             # 財務詳細資訊
             gd = self.game.data
+            assets = gd.total_assets()
             details = f"""
 === 財務詳細資訊 ===
 
 現金: ${gd.cash:.2f}
 銀行存款: ${gd.balance:.2f}
 貸款餘額: ${gd.loan:.2f}
-總資產: ${gd.total_assets():.2f}
+總資產: ${assets:.2f}
 
 存款利率: {gd.deposit_interest_rate*100:.2f}%
 貸款利率: {gd.loan_interest_rate*100:.2f}%
 
 淨資產: ${gd.balance + gd.cash - gd.loan:.2f}
 資產配置:
-- 現金占比: {(gd.cash / gd.total_assets() * 100):.1f}% (如果總資產 > 0)
-- 存款占比: {(gd.balance / gd.total_assets() * 100):.1f}% (如果總資產 > 0)
+- 現金占比: {(gd.cash / assets * 100):.1f}% (如果總資產 > 0)
+- 存款占比: {(gd.balance / assets * 100):.1f}% (如果總資產 > 0)
 
 交易歷史數量: {len(gd.transaction_history)}
             """
@@ -14,7 +14,7 @@ class EventManager:
         self.events = self._init_events()
 
     def _init_events(self):
-        industries = list({v['industry'] for v in self.game.data.stocks.values()})
+        industries = list(self.game.data.industry_codes)
         stocks = list(self.game.data.stocks.keys())
         events = [
             GameEvent('利多新聞', '某科技股利多，隨機一檔科技業股票大漲！', self.positive_news, '隨機一檔科技業股票價格上漲 10%~30%'),
@@ -73,7 +73,7 @@ class EventManager:
 
     def positive_news(self):
         # 隨機一檔科技業股票大漲
-        tech_stocks = [k for k, v in self.game.data.stocks.items() if v['industry'] == '科技業']
+        tech_stocks = self.game.data.industry_codes.get('科技業', ())
         if not tech_stocks:
             return None
         code = random.choice(tech_stocks)
@@ -81,7 +81,7 @@ class EventManager:
         percent = random.randint(10, 30)
         stock['price'] *= (1 + percent / 100)
         stock['price'] = round(stock['price'], 2)
-        stock['history'].append(stock['price'])
+        self.game.data.record_price(stock, stock['price'])
         return f"{stock['name']}價格上漲 {percent}%"
 
     def negative_news(self):
@@ -123,13 +123,14 @@ class EventManager:
     def tech_boom(self):
         # 所有科技業股票上漲
         up_list = []
-        for k, v in self.game.data.stocks.items():
-            if v['industry'] == '科技業':
-                percent = random.randint(5, 20)
-                v['price'] *= (1 + percent / 100)
-                v['price'] = round(v['price'], 2)
-                v['history'].append(v['price'])
-                up_list.append(f"{v['name']}上漲 {percent}%")
+        stocks = self.game.data.stocks
+        for code in self.game.data.industry_codes.get('科技業', ()):
+            v = stocks[code]
+            percent = random.randint(5, 20)
+            v['price'] *= (1 + percent / 100)
+            v['price'] = round(v['price'], 2)
+            self.game.data.record_price(v, v['price'])
+            up_list.append(f"{v['name']}上漲 {percent}%")
         return '，'.join(up_list) if up_list else None
 
     def industry_crisis(self):
@@ -138,26 +139,26 @@ class EventManager:
 
     def industry_boom(self):
         # 隨機一個產業所有股票大漲
-        industries = list({v['industry'] for v in self.game.data.stocks.values()})
+        industries = list(self.game.data.industry_codes)
         if not industries:
             return None
         ind = random.choice(industries)
         up_list = []
-        for k, v in self.game.data.stocks.items():
-            if v['industry'] == ind:
-                percent = random.randint(15, 30)
-                v['price'] *= (1 + percent / 100)
-                v['price'] = round(v['price'], 2)
-                v['history'].append(v['price'])
-                up_list.append(f"{v['name']}上漲 {percent}%")
+        stocks = self.game.data.stocks
+        for code in self.game.data.industry_codes[ind]:
+            v = stocks[code]
+            percent = random.randint(15, 30)
+            v['price'] *= (1 + percent / 100)
+            v['price'] = round(v['price'], 2)
+            self.game.data.record_price(v, v['price'])
+            up_list.append(f"{v['name']}上漲 {percent}%")
         return '，'.join(up_list) if up_list else None
 
     def industry_bust(self):
-        industries = list({v['industry'] for v in self.game.data.stocks.values()})
+        industries = list(self.game.data.industry_codes)
         target = random.choice(industries)
-        for stock in self.game.data.stocks.values():
-            if stock['industry'] == target:
-                stock['price'] *= random.uniform(0.7, 0.9)
+        for code in self.game.data.industry_codes[target]:
+            self.game.data.stocks[code]['price'] *= random.uniform(0.7, 0.9)
         # BUG FIX: 返回效果字串，而不是直接呼叫UI
         return f"{target} 相關股票全面下跌！"
 
@@ -171,7 +172,7 @@ class EventManager:
         percent = random.randint(20, 50)
         stock['price'] *= (1 + percent / 100)
         stock['price'] = round(stock['price'], 2)
-        stock['history'].append(stock['price'])
+        self.game.data.record_price(stock, stock['price'])
         return f"{stock['name']}上漲 {percent}%"
 
     def company_bust(self):
@@ -283,15 +284,15 @@ class EventManager:
 
     def supply_chain_crisis(self):
         # 影響隨機產業
-        industries = list({v['industry'] for v in self.game.data.stocks.values()})
+        industries = list(self.game.data.industry_codes)
         if industries:
             target_industry = random.choice(industries)
-            for stock in self.game.data.stocks.values():
-                if stock['industry'] == target_industry:
-                    percent = random.randint(10, 25)
-                    stock['price'] *= (1 - percent / 100)
-                    stock['price'] = round(stock['price'], 2)
-                    stock['history'].append(stock['price'])
+            for code in self.game.data.industry_codes[target_industry]:
+                stock = self.game.data.stocks[code]
+                percent = random.randint(10, 25)
+                stock['price'] *= (1 - percent / 100)
+                stock['price'] = round(stock['price'], 2)
+                self.game.data.record_price(stock, stock['price'])
             return f"{target_industry}遭遇供應鏈危機，股票下跌10-25%"
 
     def green_energy_boom(self):
@@ -303,7 +304,7 @@ class EventManager:
                 percent = random.randint(15, 30)
                 stock['price'] *= (1 + percent / 100)
                 stock['price'] = round(stock['price'], 2)
-                stock['history'].append(stock['price'])
+                self.game.data.record_price(stock, stock['price'])
             return "綠色能源投資熱潮，能源相關股票上漲15-30%"
 
     def consumer_boom(self):
@@ -315,7 +316,7 @@ class EventManager:
                 percent = random.randint(10, 25)
                 stock['price'] *= (1 + percent / 100)
                 stock['price'] = round(stock['price'], 2)
-                stock['history'].append(stock['price'])
+                self.game.data.record_price(stock, stock['price'])
             return "消費市場熱絡，服務業股票上漲10-25%"
 
     def tech_innovation_award(self):
@@ -327,7 +328,7 @@ class EventManager:
                 percent = random.randint(8, 20)
                 stock['price'] *= (1 + percent / 100)
                 stock['price'] = round(stock['price'], 2)
-                stock['history'].append(stock['price'])
+                self.game.data.record_price(stock, stock['price'])
             return "科技創新獎頒發，科技業股票上漲8-20%"
 
     def geopolitical_tension(self):
@@ -336,7 +337,7 @@ class EventManager:
             percent = random.randint(5, 15)
             stock['price'] *= (1 - percent / 100)
             stock['price'] = round(stock['price'], 2)
-            stock['history'].append(stock['price'])
+            self.game.data.record_price(stock, stock['price'])
         return "地緣政治緊張，所有股票下跌5-15%"
 
     def economic_data_release(self):
@@ -346,6 +347,6 @@ class EventManager:
             percent = random.randint(5, 15) * direction
             stock['price'] *= (1 + percent / 100)
             stock['price'] = round(stock['price'], 2)
-            stock['history'].append(stock['price'])
+            self.game.data.record_price(stock, stock['price'])
         trend = "利多" if direction > 0 else "利空"
         return f"經濟數據{trend}，所有股票{'上漲' if direction > 0 else '下跌'}5-15%"
\ No newline at end of file
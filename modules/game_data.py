@@ -1,9 +1,661 @@
 import os
+import functools
+import gzip
 import json
 import logging
+import random
+import sys
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # 未安裝 orjson 時改用標準庫 json
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # 未安裝 msgpack 時無法讀寫二進位存檔
+    msgpack = None
+
+
+# 舊存檔股票缺少欄位時的預設值；None 表示每檔各自建立新的空列表
+_STOCK_FIELD_DEFAULTS = (
+    ('dividend_per_share', 1),
+    ('dividend_interval', 30),
+    ('next_dividend_day', 30),
+    ('drip', False),
+    ('buy_points', None),
+    ('sell_points', None),
+)
+
+# 基金持有資料的必要欄位與預設值（讀檔時逐一補齊）
+FUND_DEFAULTS = (('nav', 100.0), ('units', 0.0), ('total_cost', 0.0))
+
+# 資料目錄：modules/ 的上一層 data/（匯入時計算一次）
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+CATALOG_PATH = os.path.join(DATA_DIR, 'store_catalog.json')
+
+# 商店目錄檔不存在或格式錯誤時的內建預設
+_DEFAULT_STORE_CATALOG = {
+    'subscriptions': {
+        'Netflix 訂閱': {'price': 0.0, 'type': 'subscription', 'amount': 15.0, 'frequency': 'monthly'},
+        'Spotify 訂閱': {'price': 0.0, 'type': 'subscription', 'amount': 10.0, 'frequency': 'monthly'},
+        '健身房會員': {'price': 0.0, 'type': 'subscription', 'amount': 30.0, 'frequency': 'monthly'},
+    },
+    'goods': {
+        '筆電': {'price': 800.0, 'type': 'goods'},
+        '自行車': {'price': 150.0, 'type': 'goods'},
+    }
+}
+
+# 讀檔後 intern 的字串欄位（皆會拿來查目錄或比對）
+INTERNED_FIELDS = (
+    'current_difficulty', 'current_company', 'education_level',
+    'current_season', 'current_weather',
+)
+
+# 讀檔後統一轉為 float 的數值欄位
+NUMERIC_FIELDS = (
+    'balance', 'cash', 'loan',
+    'deposit_interest_rate', 'loan_interest_rate',
+    'btc_balance', 'btc_hashrate', 'market_volatility',
+    'btc_mining_rate_per_kh', 'btc_price_volatility_sigma',
+)
+
+# 歷史紀錄上限：超過時捨棄最舊的項目，讓記憶體與存檔大小維持有界
+MAX_LOG_HISTORY = 5000
+LOG_HISTORY_FIELDS = ('transaction_history', 'income_history', 'expense_history', 'travel_history')
+# 歷史紀錄中取值範圍很小的字串欄位，讀檔後 intern 讓相同字串共用一個物件
+LOG_VOCAB_KEYS = ('type', 'name')
+MAX_PRICE_HISTORY = 2000
+
+# 二進位（MessagePack）存檔副檔名；JSON 存檔保留給需要人工檢視的匯出
+BINARY_SAVE_EXT = '.msave'
+
+# gzip 檔頭，讀檔時用來辨識壓縮存檔（舊版為純文字 JSON）
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _json_default(obj):
+    """存檔時 json 無法直接處理的型別：集合轉為列表、唯讀目錄轉為字典，其餘沿用舊行為轉成字串
+
+    orjson 不直接序列化 float / int 的子類別（例如 numpy.float64）而會交給這裡，
+    先轉回內建數值，才不會依是否安裝 orjson 而存成字串
+    """
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    return str(obj)
+
+
+def _dumps(data, pretty=False):
+    """將存檔資料編碼為 UTF-8 bytes；有 orjson 時優先使用"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_json_default, option=option)
+    if pretty:
+        dump_kwargs = {'indent': 2}
+    else:
+        dump_kwargs = {'separators': (',', ':')}
+    return json.dumps(data, ensure_ascii=False, default=_json_default, **dump_kwargs).encode('utf-8')
+
+
+def _pack_binary(data):
+    """以 MessagePack 編碼存檔資料"""
+    if msgpack is None:
+        raise RuntimeError('未安裝 msgpack，無法使用二進位存檔')
+    return msgpack.packb(data, use_bin_type=True, default=_json_default)
+
+
+def _unpack_binary(raw):
+    """解析 MessagePack 存檔"""
+    if msgpack is None:
+        raise RuntimeError('未安裝 msgpack，無法讀取二進位存檔')
+    return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+def _looks_like_msgpack(raw):
+    """存檔頂層是 dict：MessagePack 以 map 標記開頭（0x80-0x8f、0xde、0xdf），JSON 則是 '{' 或空白"""
+    if not raw:
+        return False
+    lead = raw[0]
+    return 0x80 <= lead <= 0x8f or lead in (0xde, 0xdf)
+
+
+def _loads(raw):
+    """解析存檔 bytes；有 orjson 時優先使用"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_save_file(file_path):
+    """讀取並解析存檔檔案；GameData.load 與其他讀存檔的工具共用，格式判斷只寫在這裡
+
+    gzip 檔頭才解壓（相容舊版純文字存檔）；依內容判斷 MessagePack，改了副檔名也能讀
+    """
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    if raw[:2] == GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    if file_path.endswith(BINARY_SAVE_EXT) or _looks_like_msgpack(raw):
+        return _unpack_binary(raw)
+    return _loads(raw)
+
+
+# 以下目錄中，會變動的模板於 reset 時深拷貝；其餘以 MappingProxyType 唯讀包裝，
+# 所有 GameData 實例共用同一份，不寫入存檔
+
+# 股票初始資料（每次 reset 由 _fresh_stock 複製，價格與持股會變動；drip 為股息再投資開關）
+_STATIC_STOCKS = {
+    'TSMC': {'name': '台積電', 'industry': '科技業', 'price': 100, 'owned': 0, 'total_cost': 0, 'history': [100], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 1, 'dividend_interval': 30, 'next_dividend_day': 30, 'drip': False},
+    'HONHAI': {'name': '鴻海', 'industry': '科技業', 'price': 80, 'owned': 0, 'total_cost': 0, 'history': [80], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 1, 'dividend_interval': 30, 'next_dividend_day': 30, 'drip': False},
+    'MTK': {'name': '聯發科', 'industry': '科技業', 'price': 120, 'owned': 0, 'total_cost': 0, 'history': [120], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 1, 'dividend_interval': 30, 'next_dividend_day': 30, 'drip': False},
+    'MINING': {'name': '挖礦公司', 'industry': '一級產業', 'price': 60, 'owned': 0, 'total_cost': 0, 'history': [60], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 2, 'dividend_interval': 30, 'next_dividend_day': 30, 'drip': False},
+    'FARM': {'name': '農業公司', 'industry': '一級產業', 'price': 50, 'owned': 0, 'total_cost': 0, 'history': [50], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 1.5, 'dividend_interval': 30, 'next_dividend_day': 30, 'drip': False},
+    'FOREST': {'name': '林業公司', 'industry': '一級產業', 'price': 55, 'owned': 0, 'total_cost': 0, 'history': [55], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 1.2, 'dividend_interval': 30, 'next_dividend_day': 30, 'drip': False},
+    'RETAIL': {'name': '零售連鎖', 'industry': '服務業', 'price': 70, 'owned': 0, 'total_cost': 0, 'history': [70], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 1, 'dividend_interval': 30, 'next_dividend_day': 30, 'drip': False},
+    'RESTAURANT': {'name': '餐飲集團', 'industry': '服務業', 'price': 65, 'owned': 0, 'total_cost': 0, 'history': [65], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 0.8, 'dividend_interval': 30, 'next_dividend_day': 30, 'drip': False},
+    'TRAVEL': {'name': '旅遊公司', 'industry': '服務業', 'price': 75, 'owned': 0, 'total_cost': 0, 'history': [75], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 0.9, 'dividend_interval': 30, 'next_dividend_day': 30, 'drip': False},
+    'BTC': {'name': '比特幣', 'industry': '虛擬貨幣', 'price': 1000000, 'owned': 0, 'total_cost': 0, 'history': [1000000], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 0, 'dividend_interval': 0, 'next_dividend_day': 0, 'drip': False}
+}
+
+# 學歷等級
+_STATIC_EDU_LEVELS = ('高中', '大學', '碩士', '博士', '博士後')
+
+# 公司目錄
+_STATIC_COMPANIES = MappingProxyType({
+    '一般公司': {'salary_multiplier': 1.00},
+    '宇宙科技': {'salary_multiplier': 1.10},
+    '幸福生活': {'salary_multiplier': 0.95},
+})
+
+# 學歷薪資倍率
+_STATIC_EDU_MULT = MappingProxyType({
+    '高中': 1.00,
+    '大學': 1.10,
+    '碩士': 1.25,
+    '博士': 1.40,
+    '博士後': 1.60,
+})
+
+# 學歷進修費用
+_STATIC_EDU_UPGRADE_COST = MappingProxyType({
+    '大學': 10000.0,
+    '碩士': 30000.0,
+    '博士': 80000.0,
+    '博士後': 150000.0,
+})
+
+# 專業技能初始值（會成長，reset 時深拷貝）
+_STATIC_PROFESSIONAL_SKILLS = {
+    '技術能力': {'level': 1, 'experience': 0, 'max_level': 10},
+    '溝通能力': {'level': 1, 'experience': 0, 'max_level': 10},
+    '領導能力': {'level': 1, 'experience': 0, 'max_level': 10},
+    '創意思考': {'level': 1, 'experience': 0, 'max_level': 10},
+    '分析能力': {'level': 1, 'experience': 0, 'max_level': 10},
+    '團隊合作': {'level': 1, 'experience': 0, 'max_level': 10},
+    '問題解決': {'level': 1, 'experience': 0, 'max_level': 10},
+    '時間管理': {'level': 1, 'experience': 0, 'max_level': 10}
+}
+
+# 職業發展路線
+_STATIC_CAREER_PATHS = MappingProxyType({
+    '科技': {
+        'levels': ['實習工程師', '初級工程師', '資深工程師', '架構師', '技術總監'],
+        'requirements': {
+            '實習工程師': {'education': '大學', 'skills': {'技術能力': 2}},
+            '初級工程師': {'education': '大學', 'skills': {'技術能力': 4}, 'experience': 2},
+            '資深工程師': {'education': '碩士', 'skills': {'技術能力': 6}, 'experience': 5},
+            '架構師': {'education': '博士', 'skills': {'技術能力': 8, '領導能力': 5}, 'experience': 8},
+            '技術總監': {'education': '博士', 'skills': {'技術能力': 10, '領導能力': 8}, 'experience': 12}
+        }
+    },
+    '管理': {
+        'levels': ['助理', '專員', '經理', '總經理', '執行長'],
+        'requirements': {
+            '助理': {'education': '大學', 'skills': {'溝通能力': 2}},
+            '專員': {'education': '大學', 'skills': {'溝通能力': 4, '分析能力': 3}, 'experience': 2},
+            '經理': {'education': '碩士', 'skills': {'領導能力': 5, '溝通能力': 6}, 'experience': 5},
+            '總經理': {'education': '博士', 'skills': {'領導能力': 8, '戰略思維': 7}, 'experience': 10},
+            '執行長': {'education': '博士後', 'skills': {'領導能力': 10, '戰略思維': 9}, 'experience': 15}
+        }
+    },
+    '創意': {
+        'levels': ['助理設計師', '初級設計師', '資深設計師', '創意總監', '藝術總監'],
+        'requirements': {
+            '助理設計師': {'education': '大學', 'skills': {'創意思考': 3}},
+            '初級設計師': {'education': '大學', 'skills': {'創意思考': 5, '技術能力': 3}, 'experience': 2},
+            '資深設計師': {'education': '碩士', 'skills': {'創意思考': 7, '溝通能力': 5}, 'experience': 6},
+            '創意總監': {'education': '博士', 'skills': {'創意思考': 9, '領導能力': 6}, 'experience': 10},
+            '藝術總監': {'education': '博士後', 'skills': {'創意思考': 10, '領導能力': 8}, 'experience': 15}
+        }
+    }
+})
+
+# 職業目錄
+_STATIC_JOBS = MappingProxyType({
+    '實習生': {'base_salary_per_day': 50.0, 'tax_rate': 0.05},
+    '工程師': {'base_salary_per_day': 120.0, 'tax_rate': 0.10},
+    '資深工程師': {'base_salary_per_day': 200.0, 'tax_rate': 0.12},
+    '經理': {'base_salary_per_day': 300.0, 'tax_rate': 0.15},
+})
+
+# 消耗品定義（唯讀；每日購買計數另存於 consumable_state）
+_STATIC_CONSUMABLES = MappingProxyType({
+    'energy_drink': {
+        'name': '能量飲料',
+        'price': 50,
+        'effects': [
+            {'type': 'stamina', 'value': 20, 'duration': 0},  # 立即恢復體力
+            {'type': 'buff', 'stat': 'productivity', 'value': 0.2, 'duration': 24}  # 臨時提升生產力
+        ],
+        'daily_limit': 5,
+        'description': '立即恢復20體力，並在24小時內提升20%生產力'
+    },
+    'study_kit': {
+        'name': '學習套組',
+        'price': 100,
+        'effects': [
+            {'type': 'buff', 'stat': 'intelligence', 'value': 0.3, 'duration': 72},
+            {'type': 'buff', 'stat': 'study_efficiency', 'value': 0.5, 'duration': 72}
+        ],
+        'daily_limit': 3,
+        'description': '72小時內提升30%智力成長與50%學習效率'
+    },
+    'social_card': {
+        'name': '社交卡',
+        'price': 80,
+        'effects': [
+            {'type': 'buff', 'stat': 'charisma', 'value': 0.4, 'duration': 48},
+            {'type': 'buff', 'stat': 'luck', 'value': 0.3, 'duration': 24}
+        ],
+        'daily_limit': 3,
+        'description': '48小時內提升40%魅力，24小時內提升30%運氣'
+    }
+})
+
+# 難度設定
+_STATIC_DIFFICULTY = MappingProxyType({
+    'easy': {
+        'salary_multiplier': 1.2,
+        'expense_multiplier': 0.8,
+        'stock_volatility': 0.8,
+        'event_frequency': 0.8,
+        'event_severity': 0.8,
+        'activity_benefit': 1.2,
+        'activity_cooldown': 0.8
+    },
+    'normal': {
+        'salary_multiplier': 1.0,
+        'expense_multiplier': 1.0,
+        'stock_volatility': 1.0,
+        'event_frequency': 1.0,
+        'event_severity': 1.0,
+        'activity_benefit': 1.0,
+        'activity_cooldown': 1.0
+    },
+    'hard': {
+        'salary_multiplier': 0.8,
+        'expense_multiplier': 1.2,
+        'stock_volatility': 1.2,
+        'event_frequency': 1.2,
+        'event_severity': 1.2,
+        'activity_benefit': 0.8,
+        'activity_cooldown': 1.2
+    }
+})
+
+# 景氣階段轉換表：目前階段 -> (機率 40% 的下一階段, 其餘情況的下一階段)
+_NEXT_PHASE = {
+    'normal': ('boom', 'recession'),
+    'boom': ('normal', 'normal'),
+    'recession': ('normal', 'normal'),
+}
+
+# 景氣階段顯示名稱
+_PHASE_TEXT = {'boom': '榮景', 'normal': '正常', 'recession': '衰退'}
+
+# 各階段的 (強度範圍, 波動範圍)，進入該階段時在範圍內均勻抽樣
+_PHASE_PARAMS = {
+    'boom': ((1.2, 1.5), (0.015, 0.025)),
+    'recession': ((0.6, 0.8), (0.02, 0.035)),
+    'normal': ((1.0, 1.0), (0.01, 0.01)),
+}
+
+# 產業景氣循環初始狀態（會變動，reset 時深拷貝）
+_STATIC_ECONOMIC_CYCLES = {
+    '科技業': {'phase': 'normal', 'strength': 1.0, 'duration': 0, 'volatility': 0.01},
+    '服務業': {'phase': 'normal', 'strength': 1.0, 'duration': 0, 'volatility': 0.01},
+    '一級產業': {'phase': 'normal', 'strength': 1.0, 'duration': 0, 'volatility': 0.01},
+    '虛擬貨幣': {'phase': 'normal', 'strength': 1.0, 'duration': 0, 'volatility': 0.03}
+}
+
+# 社交活動
+_STATIC_SOCIAL_ACTIVITIES = MappingProxyType({
+    'meet_friend': {'name': '見朋友', 'cost': 30, 'stamina_cost': 5, 'affinity_gain': 5},
+    'family_gathering': {'name': '家庭聚會', 'cost': 50, 'stamina_cost': 8, 'affinity_gain': 8},
+    'business_networking': {'name': '商業社交', 'cost': 80, 'stamina_cost': 10, 'affinity_gain': 6},
+    'date_night': {'name': '約會', 'cost': 100, 'stamina_cost': 12, 'affinity_gain': 12},
+    'party': {'name': '參加派對', 'cost': 60, 'stamina_cost': 15, 'affinity_gain': 10},
+})
+
+# 房屋目錄
+_STATIC_HOUSES = MappingProxyType({
+    'apartment_small': {
+        'name': '小公寓',
+        'price': 50000,
+        'maintenance_cost': 500,
+        'capacity': 2,
+        'description': '適合單身或小家庭的溫馨住所'
+    },
+    'apartment_medium': {
+        'name': '中型公寓',
+        'price': 150000,
+        'maintenance_cost': 1200,
+        'capacity': 4,
+        'description': '舒適的居住環境，適合小家庭'
+    },
+    'house_small': {
+        'name': '小型透天',
+        'price': 300000,
+        'maintenance_cost': 2000,
+        'capacity': 6,
+        'description': '獨立的透天住宅，有小院子'
+    },
+    'house_large': {
+        'name': '大型別墅',
+        'price': 800000,
+        'maintenance_cost': 5000,
+        'capacity': 10,
+        'description': '豪華別墅，寬敞舒適的生活空間'
+    }
+})
+
+# 家具目錄
+_STATIC_FURNITURE = MappingProxyType({
+    'bed_basic': {'name': '基礎床鋪', 'price': 2000, 'comfort': 5, 'category': 'bedroom'},
+    'bed_luxury': {'name': '豪華床鋪', 'price': 8000, 'comfort': 15, 'category': 'bedroom'},
+    'sofa_basic': {'name': '基礎沙發', 'price': 3000, 'comfort': 8, 'category': 'living_room'},
+    'sofa_luxury': {'name': '豪華沙發', 'price': 12000, 'comfort': 20, 'category': 'living_room'},
+    'table_dining': {'name': '餐桌組', 'price': 5000, 'comfort': 10, 'category': 'dining'},
+    'kitchen_appliance': {'name': '廚房電器', 'price': 10000, 'comfort': 12, 'category': 'kitchen'},
+    'entertainment_system': {'name': '娛樂系統', 'price': 15000, 'comfort': 18, 'category': 'living_room'},
+    'home_office': {'name': '家庭辦公室', 'price': 8000, 'comfort': 14, 'category': 'office'}
+})
+
+# 旅遊目的地
+_STATIC_DESTINATIONS = MappingProxyType({
+    'tokyo': {
+        'name': '東京',
+        'cost': 30000,
+        'duration': 7,
+        'experience_gain': 50,
+        'culture_bonus': 15,
+        'description': '現代都市，科技與傳統並存',
+        'special_events': ['富士山之旅', '淺草寺參拜', '銀座購物']
+    },
+    'paris': {
+        'name': '巴黎',
+        'cost': 45000,
+        'duration': 10,
+        'experience_gain': 70,
+        'culture_bonus': 20,
+        'description': '浪漫之都，藝術與時尚的殿堂',
+        'special_events': ['艾菲爾鐵塔', '盧浮宮參觀', '塞納河遊船']
+    },
+    'bali': {
+        'name': '峇里島',
+        'cost': 25000,
+        'duration': 14,
+        'experience_gain': 60,
+        'culture_bonus': 25,
+        'description': '熱帶度假勝地，寧靜與冒險並存',
+        'special_events': ['海灘度假', '火山登山', '傳統舞蹈表演']
+    },
+    'new_york': {
+        'name': '紐約',
+        'cost': 50000,
+        'duration': 12,
+        'experience_gain': 80,
+        'culture_bonus': 18,
+        'description': '大蘋果，夢想的起點',
+        'special_events': ['時代廣場', '中央公園', '博物館巡禮']
+    },
+    'kyoto': {
+        'name': '京都',
+        'cost': 28000,
+        'duration': 8,
+        'experience_gain': 55,
+        'culture_bonus': 30,
+        'description': '日本古都，傳統文化寶庫',
+        'special_events': ['金閣寺', '嵐山賞楓', '茶道體驗']
+    }
+})
+
+# 每日活動規則：每日上限與冷卻天數
+_STATIC_ACTIVITY_RULES = MappingProxyType({
+    'study': {'daily_max': 3, 'cooldown_days': 1},
+    'workout': {'daily_max': 3, 'cooldown_days': 1},
+    'social': {'daily_max': 3, 'cooldown_days': 1},
+    'meditate': {'daily_max': 3, 'cooldown_days': 1},
+})
+
+# 健康活動
+_STATIC_HEALTH_ACTIVITIES = MappingProxyType({
+    '輕度運動': {'stamina_cost': 10, 'health_gain': 5, 'duration': 30},
+    '中度運動': {'stamina_cost': 20, 'health_gain': 10, 'duration': 60},
+    '劇烈運動': {'stamina_cost': 35, 'health_gain': 15, 'duration': 90},
+    '冥想放鬆': {'stamina_cost': 5, 'mental_gain': 10, 'duration': 20},
+    '健康檢查': {'cost': 200, 'health_boost': 20, 'duration': 60},
+    '營養補充': {'cost': 50, 'health_gain': 8, 'duration': 10},
+    '按摩治療': {'cost': 150, 'stress_reduction': 20, 'duration': 45},
+    '心理諮詢': {'cost': 300, 'mental_gain': 25, 'duration': 60}
+})
+
+# 疾病類型
+_STATIC_DISEASE_TYPES = MappingProxyType({
+    '感冒': {
+        'severity': 'mild',
+        'duration_days': 7,
+        'health_penalty': 15,
+        'stamina_penalty': 20,
+        'contagious': True,
+        'treatment_cost': 100
+    },
+    '流感': {
+        'severity': 'moderate',
+        'duration_days': 14,
+        'health_penalty': 25,
+        'stamina_penalty': 35,
+        'contagious': True,
+        'treatment_cost': 300
+    },
+    '肺炎': {
+        'severity': 'severe',
+        'duration_days': 21,
+        'health_penalty': 40,
+        'stamina_penalty': 50,
+        'contagious': False,
+        'treatment_cost': 800
+    },
+    '胃腸炎': {
+        'severity': 'moderate',
+        'duration_days': 5,
+        'health_penalty': 20,
+        'stamina_penalty': 30,
+        'contagious': True,
+        'treatment_cost': 200
+    },
+    '憂鬱症': {
+        'severity': 'moderate',
+        'duration_days': 30,
+        'mental_penalty': 30,
+        'happiness_penalty': 25,
+        'contagious': False,
+        'treatment_cost': 500
+    },
+    '焦慮症': {
+        'severity': 'mild',
+        'duration_days': 20,
+        'mental_penalty': 20,
+        'happiness_penalty': 15,
+        'contagious': False,
+        'treatment_cost': 350
+    },
+    '慢性疲勞': {
+        'severity': 'moderate',
+        'duration_days': 45,
+        'stamina_penalty': 25,
+        'health_penalty': 10,
+        'contagious': False,
+        'treatment_cost': 600
+    }
+})
+
+# 基金目錄
+_STATIC_FUNDS_CATALOG = MappingProxyType({
+    '台灣科技ETF': {
+        'weights': {'TSMC': 0.5, 'HONHAI': 0.3, 'MTK': 0.2},
+        'fee_rate': 0.002
+    },
+    '服務業綜合ETF': {
+        'weights': {'RETAIL': 0.34, 'RESTAURANT': 0.33, 'TRAVEL': 0.33},
+        'fee_rate': 0.002
+    },
+    '一級產業ETF': {
+        'weights': {'MINING': 0.34, 'FARM': 0.33, 'FOREST': 0.33},
+        'fee_rate': 0.002
+    }
+})
+
+
+# 股票代碼對應產業別，讀檔補齊舊存檔的 industry 欄位
+_INDUSTRY_MAP = {
+    'TSMC': '科技業', 'HONHAI': '科技業', 'MTK': '科技業',
+    'MINING': '一級產業', 'FARM': '一級產業', 'FOREST': '一級產業',
+    'RETAIL': '服務業', 'RESTAURANT': '服務業', 'TRAVEL': '服務業',
+}
+
+_STATIC_SEASONS = ('spring', 'summer', 'autumn', 'winter')
+
+_STATIC_WEATHER_TYPES = MappingProxyType({
+    'sunny': {'name': '晴天', 'effect': {'happiness': 5, 'energy': 10}},
+    'cloudy': {'name': '陰天', 'effect': {'happiness': -2, 'energy': 5}},
+    'rainy': {'name': '雨天', 'effect': {'happiness': -5, 'energy': -5}},
+    'stormy': {'name': '暴風雨', 'effect': {'happiness': -10, 'energy': -15}},
+    'snowy': {'name': '雪天', 'effect': {'happiness': 5, 'energy': -10}}
+})
+
+_STATIC_SEASONAL_ACTIVITIES = MappingProxyType({
+    'spring': {
+        'name': '春天',
+        'activities': ['賞花', '踏青', '植樹', '春遊'],
+        'effects': {'happiness': 10, 'health': 5},
+        'special_events': ['櫻花季', '春雨綿綿']
+    },
+    'summer': {
+        'name': '夏天',
+        'activities': ['游泳', '度假', '吃冰', '避暑'],
+        'effects': {'happiness': 8, 'stamina': -10},
+        'special_events': ['暑假旅行', '海灘派對']
+    },
+    'autumn': {
+        'name': '秋天',
+        'activities': ['賞楓', '秋遊', '採果', '賞月'],
+        'effects': {'happiness': 12, 'intelligence': 5},
+        'special_events': ['中秋節', '楓葉季']
+    },
+    'winter': {
+        'name': '冬天',
+        'activities': ['賞雪', '溫泉', '滑雪', '圍爐'],
+        'effects': {'happiness': 6, 'stamina': -5},
+        'special_events': ['聖誕節', '跨年活動']
+    }
+})
+
+
+
+def _fresh_stock(code):
+    """依模板建立一檔新股票；只有列表需要各自複製，其餘欄位皆為不可變值"""
+    template = _STATIC_STOCKS[code]
+    return {**template, 'history': list(template['history']), 'buy_points': [], 'sell_points': []}
+
+
+def _upgrade_stock_schema(code, stock):
+    """就地補齊舊存檔股票缺少的欄位（存檔中的值優先；買賣點列表每檔各自建立）"""
+    stock.setdefault('industry', _INDUSTRY_MAP.get(code, '未知'))
+    for key, default in _STOCK_FIELD_DEFAULTS:
+        stock.setdefault(key, [] if default is None else default)
+    stock['price'] = float(stock['price'])
+
+
+def _copy_rows(template):
+    """複製兩層的 {key: {欄位: 純量}} 模板，比 deepcopy 省去逐一檢查型別與 memo"""
+    return {key: dict(row) for key, row in template.items()}
 
 
 class GameData:
+    # 景氣循環參數：每日隨機轉換階段的機率，與各階段持續天數上下限
+    cycle_transition_prob = 0.05
+    cycle_duration_range = MappingProxyType({
+        'normal': (60, 180),
+        'boom': (30, 90),
+        'recession': (30, 120),
+    })
+
+    # 唯讀靜態目錄放在類別上，所有實例共用，也不會出現在實例 __dict__ 或存檔中
+    # 公司目錄（影響薪資倍率）與學歷
+    companies_catalog = _STATIC_COMPANIES
+    education_levels = _STATIC_EDU_LEVELS
+    education_multipliers = _STATIC_EDU_MULT
+    education_upgrade_cost = _STATIC_EDU_UPGRADE_COST
+    # 職業發展系統
+    career_paths = _STATIC_CAREER_PATHS
+    # 職業目錄（可於 UI 選擇），金額單位：遊戲幣/日
+    jobs_catalog = _STATIC_JOBS
+    # 難度模式設定
+    difficulty_levels = _STATIC_DIFFICULTY
+    # 社交活動、房屋、家具與旅遊目的地
+    available_social_activities = _STATIC_SOCIAL_ACTIVITIES
+    houses_catalog = _STATIC_HOUSES
+    furniture_catalog = _STATIC_FURNITURE
+    destinations_catalog = _STATIC_DESTINATIONS
+    # 健康活動與疾病類型
+    health_activities = _STATIC_HEALTH_ACTIVITIES
+    disease_types = _STATIC_DISEASE_TYPES
+    # 可供交易的基金目錄：每檔包含股票權重（以股票代碼為鍵，權重總和為1），與手續費率（單邊）
+    funds_catalog = _STATIC_FUNDS_CATALOG
+    # 季節、天氣與季節活動
+    seasons = _STATIC_SEASONS
+    weather_types = _STATIC_WEATHER_TYPES
+    seasonal_activities = _STATIC_SEASONAL_ACTIVITIES
+    # 消耗品定義：名稱、價格、效果、持續時間(天)、每日限購、描述
+    consumables = _STATIC_CONSUMABLES
+    # 每日活動規則：每個活動的每日上限與冷卻天數
+    activity_rules = _STATIC_ACTIVITY_RULES
+
+    # 執行期物件，不寫入存檔
+    _TRANSIENT_KEYS = frozenset({
+        'achievements_manager', 'fund_vectors', 'buff_totals', 'industry_codes', 'current_illness_names',
+        '_illness_names',
+    })
+    # 靜態目錄：定義在類別上或由 reset() 重建，不寫入存檔，讀檔時也不採用存檔中的舊值
+    _STATIC_KEYS = frozenset({
+        'companies_catalog', 'education_levels', 'education_multipliers', 'education_upgrade_cost',
+        'career_paths', 'jobs_catalog', 'difficulty_levels', 'available_social_activities',
+        'houses_catalog', 'furniture_catalog', 'destinations_catalog', 'health_activities',
+        'disease_types', 'funds_catalog', 'store_catalog', 'activity_rules', 'consumables',
+        'seasons', 'weather_types', 'seasonal_activities', 'season_duration_days',
+    })
+
     def __init__(self):
         self.reborn_count = 0
         self.reset()
@@ -15,32 +667,11 @@ class GameData:
         self.deposit_interest_rate = 0.01
         self.loan_interest_rate = 0.005
         
-        # 初始化消耗品每日購買計數
-        if hasattr(self, 'consumables'):
-            for item_id in self.consumables:
-                self.consumables[item_id]['daily_bought'] = 0
-        
-        # 初始化活躍 Buff
-        self.active_buffs = []
-        
         # 設定預設難度
         self.current_difficulty = 'normal'
         # 多檔股票資料
-        self.stocks = {
-            'TSMC': {'name': '台積電', 'industry': '科技業', 'price': 100, 'owned': 0, 'total_cost': 0, 'history': [100], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 1, 'dividend_interval': 30, 'next_dividend_day': 30},
-            'HONHAI': {'name': '鴻海', 'industry': '科技業', 'price': 80, 'owned': 0, 'total_cost': 0, 'history': [80], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 1, 'dividend_interval': 30, 'next_dividend_day': 30},
-            'MTK': {'name': '聯發科', 'industry': '科技業', 'price': 120, 'owned': 0, 'total_cost': 0, 'history': [120], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 1, 'dividend_interval': 30, 'next_dividend_day': 30},
-            'MINING': {'name': '挖礦公司', 'industry': '一級產業', 'price': 60, 'owned': 0, 'total_cost': 0, 'history': [60], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 2, 'dividend_interval': 30, 'next_dividend_day': 30},
-            'FARM': {'name': '農業公司', 'industry': '一級產業', 'price': 50, 'owned': 0, 'total_cost': 0, 'history': [50], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 1.5, 'dividend_interval': 30, 'next_dividend_day': 30},
-            'FOREST': {'name': '林業公司', 'industry': '一級產業', 'price': 55, 'owned': 0, 'total_cost': 0, 'history': [55], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 1.2, 'dividend_interval': 30, 'next_dividend_day': 30},
-            'RETAIL': {'name': '零售連鎖', 'industry': '服務業', 'price': 70, 'owned': 0, 'total_cost': 0, 'history': [70], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 1, 'dividend_interval': 30, 'next_dividend_day': 30},
-            'RESTAURANT': {'name': '餐飲集團', 'industry': '服務業', 'price': 65, 'owned': 0, 'total_cost': 0, 'history': [65], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 0.8, 'dividend_interval': 30, 'next_dividend_day': 30},
-            'TRAVEL': {'name': '旅遊公司', 'industry': '服務業', 'price': 75, 'owned': 0, 'total_cost': 0, 'history': [75], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 0.9, 'dividend_interval': 30, 'next_dividend_day': 30},
-            'BTC': {'name': '比特幣', 'industry': '虛擬貨幣', 'price': 1000000, 'owned': 0, 'total_cost': 0, 'history': [1000000], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 0, 'dividend_interval': 0, 'next_dividend_day': 0}
-        }
-        # 每檔股票新增 DRIP（股息再投資）開關，預設 False
-        for code, stock in self.stocks.items():
-            stock['drip'] = False
+        self.stocks = {code: _fresh_stock(code) for code in _STATIC_STOCKS}
+        self._build_industry_index()
         self.btc_balance = 0.0
         self.btc_miner_count = 0
         self.btc_hashrate = 0.0
@@ -68,14 +699,7 @@ class GameData:
         self.last_luck_day = -1
         if is_reborn:
             self.reborn_count += 1
-        # --- Activities 規則與狀態（冷卻與每日上限）---
-        # activity_rules: 每個活動的每日上限與冷卻天數
-        self.activity_rules = {
-            'study': {'daily_max': 3, 'cooldown_days': 1},
-            'workout': {'daily_max': 3, 'cooldown_days': 1},
-            'social': {'daily_max': 3, 'cooldown_days': 1},
-            'meditate': {'daily_max': 3, 'cooldown_days': 1},
-        }
+        # --- Activities 狀態（冷卻與每日上限；規則為類別上的 activity_rules）---
         # activity_state: 當日剩餘次數與冷卻剩餘天數
         self.activity_state = {
             k: {'remaining': v['daily_max'], 'cd_left': 0}
@@ -84,91 +708,22 @@ class GameData:
         # --- Work Mode (上班模式) 預設欄位 ---
         # 當前工作：name, level, salary_per_day, tax_rate, next_promotion_day
         self.job = None
-        # 任職公司與公司目錄（影響薪資倍率）
+        # 任職公司（公司目錄影響薪資倍率）
         self.current_company = '一般公司'
-        self.companies_catalog = {
-            '一般公司': {'salary_multiplier': 1.00},
-            '宇宙科技': {'salary_multiplier': 1.10},
-            '幸福生活': {'salary_multiplier': 0.95},
-        }
         # 收入歷史：[{day, type:'salary', gross, tax, net}]
         self.income_history = []
         # 教育與職業進階系統
         self.education_level = '高中'
-        self.education_levels = ['高中', '大學', '碩士', '博士', '博士後']
-        self.education_multipliers = {
-            '高中': 1.00,
-            '大學': 1.10,
-            '碩士': 1.25,
-            '博士': 1.40,
-            '博士後': 1.60,
-        }
-        self.education_upgrade_cost = {
-            '大學': 10000.0,
-            '碩士': 30000.0,
-            '博士': 80000.0,
-            '博士後': 150000.0,
-        }
         self.education_study_progress = {}  # {education_level: progress_days}
         
         # 專業技能系統
-        self.professional_skills = {
-            '技術能力': {'level': 1, 'experience': 0, 'max_level': 10},
-            '溝通能力': {'level': 1, 'experience': 0, 'max_level': 10},
-            '領導能力': {'level': 1, 'experience': 0, 'max_level': 10},
-            '創意思考': {'level': 1, 'experience': 0, 'max_level': 10},
-            '分析能力': {'level': 1, 'experience': 0, 'max_level': 10},
-            '團隊合作': {'level': 1, 'experience': 0, 'max_level': 10},
-            '問題解決': {'level': 1, 'experience': 0, 'max_level': 10},
-            '時間管理': {'level': 1, 'experience': 0, 'max_level': 10}
-        }
-        
-        # 職業發展系統
-        self.career_paths = {
-            '科技': {
-                'levels': ['實習工程師', '初級工程師', '資深工程師', '架構師', '技術總監'],
-                'requirements': {
-                    '實習工程師': {'education': '大學', 'skills': {'技術能力': 2}},
-                    '初級工程師': {'education': '大學', 'skills': {'技術能力': 4}, 'experience': 2},
-                    '資深工程師': {'education': '碩士', 'skills': {'技術能力': 6}, 'experience': 5},
-                    '架構師': {'education': '博士', 'skills': {'技術能力': 8, '領導能力': 5}, 'experience': 8},
-                    '技術總監': {'education': '博士', 'skills': {'技術能力': 10, '領導能力': 8}, 'experience': 12}
-                }
-            },
-            '管理': {
-                'levels': ['助理', '專員', '經理', '總經理', '執行長'],
-                'requirements': {
-                    '助理': {'education': '大學', 'skills': {'溝通能力': 2}},
-                    '專員': {'education': '大學', 'skills': {'溝通能力': 4, '分析能力': 3}, 'experience': 2},
-                    '經理': {'education': '碩士', 'skills': {'領導能力': 5, '溝通能力': 6}, 'experience': 5},
-                    '總經理': {'education': '博士', 'skills': {'領導能力': 8, '戰略思維': 7}, 'experience': 10},
-                    '執行長': {'education': '博士後', 'skills': {'領導能力': 10, '戰略思維': 9}, 'experience': 15}
-                }
-            },
-            '創意': {
-                'levels': ['助理設計師', '初級設計師', '資深設計師', '創意總監', '藝術總監'],
-                'requirements': {
-                    '助理設計師': {'education': '大學', 'skills': {'創意思考': 3}},
-                    '初級設計師': {'education': '大學', 'skills': {'創意思考': 5, '技術能力': 3}, 'experience': 2},
-                    '資深設計師': {'education': '碩士', 'skills': {'創意思考': 7, '溝通能力': 5}, 'experience': 6},
-                    '創意總監': {'education': '博士', 'skills': {'創意思考': 9, '領導能力': 6}, 'experience': 10},
-                    '藝術總監': {'education': '博士後', 'skills': {'創意思考': 10, '領導能力': 8}, 'experience': 15}
-                }
-            }
-        }
+        self.professional_skills = _copy_rows(_STATIC_PROFESSIONAL_SKILLS)
         
         # 當前職業狀態
         self.current_career_path = None
         self.career_level = 0
         self.career_experience = 0
         self.career_history = []  # 職業變更記錄
-        # 職業目錄（可於 UI 選擇），金額單位：遊戲幣/日
-        self.jobs_catalog = {
-            '實習生': {'base_salary_per_day': 50.0, 'tax_rate': 0.05},
-            '工程師': {'base_salary_per_day': 120.0, 'tax_rate': 0.10},
-            '資深工程師': {'base_salary_per_day': 200.0, 'tax_rate': 0.12},
-            '經理': {'base_salary_per_day': 300.0, 'tax_rate': 0.15},
-        }
         # --- Expenses (支出) 預設欄位 ---
         # 支出列表：[{name, amount, frequency:'daily'|'weekly'|'monthly', next_due_day:int}]
         self.expenses = []
@@ -179,86 +734,18 @@ class GameData:
         # 商店：可購買的項目與玩家物品清單（嘗試外部讀取 data/store_catalog.json）
         self.store_catalog = self._load_store_catalog_external()
         
-        # 消耗品定義：名稱、價格、效果、持續時間(天)、每日限購、描述
-        self.consumables = {
-            'energy_drink': {
-                'name': '能量飲料',
-                'price': 50,
-                'effects': [
-                    {'type': 'stamina', 'value': 20, 'duration': 0},  # 立即恢復體力
-                    {'type': 'buff', 'stat': 'productivity', 'value': 0.2, 'duration': 24}  # 臨時提升生產力
-                ],
-                'daily_limit': 5,
-                'daily_bought': 0,
-                'description': '立即恢復20體力，並在24小時內提升20%生產力'
-            },
-            'study_kit': {
-                'name': '學習套組',
-                'price': 100,
-                'effects': [
-                    {'type': 'buff', 'stat': 'intelligence', 'value': 0.3, 'duration': 72},
-                    {'type': 'buff', 'stat': 'study_efficiency', 'value': 0.5, 'duration': 72}
-                ],
-                'daily_limit': 3,
-                'daily_bought': 0,
-                'description': '72小時內提升30%智力成長與50%學習效率'
-            },
-            'social_card': {
-                'name': '社交卡',
-                'price': 80,
-                'effects': [
-                    {'type': 'buff', 'stat': 'charisma', 'value': 0.4, 'duration': 48},
-                    {'type': 'buff', 'stat': 'luck', 'value': 0.3, 'duration': 24}
-                ],
-                'daily_limit': 3,
-                'daily_bought': 0,
-                'description': '48小時內提升40%魅力，24小時內提升30%運氣'
-            }
-        }
+        # 消耗品的每日購買計數（消耗品定義為類別上的唯讀目錄） {item_id: {'daily_bought': int}}，與定義分開存放
+        self.consumable_state = {item_id: {'daily_bought': 0} for item_id in self.consumables}
         
         # 玩家庫存：儲存擁有的消耗品 {item_id: quantity}
         self.inventory = {item_id: 0 for item_id in self.consumables}
         
-        # 活躍的 Buff 效果
+        # 活躍的 Buff 效果，與各屬性的加成總和（隨增減同步維護）
         self.active_buffs = []
+        self.buff_totals = {}
         
-        # 難度模式設定
-        self.difficulty_levels = {
-            'easy': {
-                'salary_multiplier': 1.2,
-                'expense_multiplier': 0.8,
-                'stock_volatility': 0.8,
-                'event_frequency': 0.8,
-                'event_severity': 0.8,
-                'activity_benefit': 1.2,
-                'activity_cooldown': 0.8
-            },
-            'normal': {
-                'salary_multiplier': 1.0,
-                'expense_multiplier': 1.0,
-                'stock_volatility': 1.0,
-                'event_frequency': 1.0,
-                'event_severity': 1.0,
-                'activity_benefit': 1.0,
-                'activity_cooldown': 1.0
-            },
-            'hard': {
-                'salary_multiplier': 0.8,
-                'expense_multiplier': 1.2,
-                'stock_volatility': 1.2,
-                'event_frequency': 1.2,
-                'event_severity': 1.2,
-                'activity_benefit': 0.8,
-                'activity_cooldown': 1.2
-            }
-        }
         # 產業景氣循環系統
-        self.economic_cycles = {
-            '科技業': {'phase': 'normal', 'strength': 1.0, 'duration': 0, 'volatility': 0.01},
-            '服務業': {'phase': 'normal', 'strength': 1.0, 'duration': 0, 'volatility': 0.01},
-            '一級產業': {'phase': 'normal', 'strength': 1.0, 'duration': 0, 'volatility': 0.01},
-            '虛擬貨幣': {'phase': 'normal', 'strength': 1.0, 'duration': 0, 'volatility': 0.03}
-        }
+        self.economic_cycles = _copy_rows(_STATIC_ECONOMIC_CYCLES)
         # 活動計數追蹤（用於成就系統）
         self.activity_study_count = 0
         self.activity_workout_count = 0
@@ -273,109 +760,15 @@ class GameData:
         # 社交系統
         self.social_contacts = {}  # {contact_id: {'name': str, 'relationship': str, 'affinity': int, 'last_interaction': int}}
         self.social_events = []  # 社交事件歷史
-        self.available_social_activities = {
-            'meet_friend': {'name': '見朋友', 'cost': 30, 'stamina_cost': 5, 'affinity_gain': 5},
-            'family_gathering': {'name': '家庭聚會', 'cost': 50, 'stamina_cost': 8, 'affinity_gain': 8},
-            'business_networking': {'name': '商業社交', 'cost': 80, 'stamina_cost': 10, 'affinity_gain': 6},
-            'date_night': {'name': '約會', 'cost': 100, 'stamina_cost': 12, 'affinity_gain': 12},
-            'party': {'name': '參加派對', 'cost': 60, 'stamina_cost': 15, 'affinity_gain': 10},
-        }
         self.social_cooldowns = {}  # 社交活動冷卻時間
         
         # 房屋系統
-        self.houses_catalog = {
-            'apartment_small': {
-                'name': '小公寓',
-                'price': 50000,
-                'maintenance_cost': 500,
-                'capacity': 2,
-                'description': '適合單身或小家庭的溫馨住所'
-            },
-            'apartment_medium': {
-                'name': '中型公寓',
-                'price': 150000,
-                'maintenance_cost': 1200,
-                'capacity': 4,
-                'description': '舒適的居住環境，適合小家庭'
-            },
-            'house_small': {
-                'name': '小型透天',
-                'price': 300000,
-                'maintenance_cost': 2000,
-                'capacity': 6,
-                'description': '獨立的透天住宅，有小院子'
-            },
-            'house_large': {
-                'name': '大型別墅',
-                'price': 800000,
-                'maintenance_cost': 5000,
-                'capacity': 10,
-                'description': '豪華別墅，寬敞舒適的生活空間'
-            }
-        }
         self.current_house = None  # 當前擁有的房屋
         self.house_furniture = {}  # 已購買的家具 {furniture_id: quantity}
-        self.furniture_catalog = {
-            'bed_basic': {'name': '基礎床鋪', 'price': 2000, 'comfort': 5, 'category': 'bedroom'},
-            'bed_luxury': {'name': '豪華床鋪', 'price': 8000, 'comfort': 15, 'category': 'bedroom'},
-            'sofa_basic': {'name': '基礎沙發', 'price': 3000, 'comfort': 8, 'category': 'living_room'},
-            'sofa_luxury': {'name': '豪華沙發', 'price': 12000, 'comfort': 20, 'category': 'living_room'},
-            'table_dining': {'name': '餐桌組', 'price': 5000, 'comfort': 10, 'category': 'dining'},
-            'kitchen_appliance': {'name': '廚房電器', 'price': 10000, 'comfort': 12, 'category': 'kitchen'},
-            'entertainment_system': {'name': '娛樂系統', 'price': 15000, 'comfort': 18, 'category': 'living_room'},
-            'home_office': {'name': '家庭辦公室', 'price': 8000, 'comfort': 14, 'category': 'office'}
-        }
         self.house_comfort_level = 0  # 房屋舒適度
         self.house_maintenance_due = 0  # 下次維護費用到期日
         
         # 旅行系統
-        self.destinations_catalog = {
-            'tokyo': {
-                'name': '東京',
-                'cost': 30000,
-                'duration': 7,
-                'experience_gain': 50,
-                'culture_bonus': 15,
-                'description': '現代都市，科技與傳統並存',
-                'special_events': ['富士山之旅', '淺草寺參拜', '銀座購物']
-            },
-            'paris': {
-                'name': '巴黎',
-                'cost': 45000,
-                'duration': 10,
-                'experience_gain': 70,
-                'culture_bonus': 20,
-                'description': '浪漫之都，藝術與時尚的殿堂',
-                'special_events': ['艾菲爾鐵塔', '盧浮宮參觀', '塞納河遊船']
-            },
-            'bali': {
-                'name': '峇里島',
-                'cost': 25000,
-                'duration': 14,
-                'experience_gain': 60,
-                'culture_bonus': 25,
-                'description': '熱帶度假勝地，寧靜與冒險並存',
-                'special_events': ['海灘度假', '火山登山', '傳統舞蹈表演']
-            },
-            'new_york': {
-                'name': '紐約',
-                'cost': 50000,
-                'duration': 12,
-                'experience_gain': 80,
-                'culture_bonus': 18,
-                'description': '大蘋果，夢想的起點',
-                'special_events': ['時代廣場', '中央公園', '博物館巡禮']
-            },
-            'kyoto': {
-                'name': '京都',
-                'cost': 28000,
-                'duration': 8,
-                'experience_gain': 55,
-                'culture_bonus': 30,
-                'description': '日本古都，傳統文化寶庫',
-                'special_events': ['金閣寺', '嵐山賞楓', '茶道體驗']
-            }
-        }
         self.travel_history = []  # 旅行記錄
         self.current_trip = None  # 當前旅行狀態
         # 健康系統
@@ -385,6 +778,7 @@ class GameData:
 
         # 疾病系統
         self.current_illnesses = []  # 當前疾病列表
+        self._illness_names = None  # current_illness_names 的快取，第一次讀取時才由 current_illnesses 建立
         self.past_illnesses = []  # 過往疾病記錄
         self.illness_resistance = {}  # 對各種疾病的抗性
 
@@ -398,108 +792,74 @@ class GameData:
         self.sleep_quality = 100  # 睡眠品質
         self.diet_quality = 100  # 飲食品質
         self.stress_level = 0  # 壓力水平
-
-        # 健康活動
-        self.health_activities = {
-            '輕度運動': {'stamina_cost': 10, 'health_gain': 5, 'duration': 30},
-            '中度運動': {'stamina_cost': 20, 'health_gain': 10, 'duration': 60},
-            '劇烈運動': {'stamina_cost': 35, 'health_gain': 15, 'duration': 90},
-            '冥想放鬆': {'stamina_cost': 5, 'mental_gain': 10, 'duration': 20},
-            '健康檢查': {'cost': 200, 'health_boost': 20, 'duration': 60},
-            '營養補充': {'cost': 50, 'health_gain': 8, 'duration': 10},
-            '按摩治療': {'cost': 150, 'stress_reduction': 20, 'duration': 45},
-            '心理諮詢': {'cost': 300, 'mental_gain': 25, 'duration': 60}
-        }
-
-        # 疾病類型
-        self.disease_types = {
-            '感冒': {
-                'severity': 'mild',
-                'duration_days': 7,
-                'health_penalty': 15,
-                'stamina_penalty': 20,
-                'contagious': True,
-                'treatment_cost': 100
-            },
-            '流感': {
-                'severity': 'moderate',
-                'duration_days': 14,
-                'health_penalty': 25,
-                'stamina_penalty': 35,
-                'contagious': True,
-                'treatment_cost': 300
-            },
-            '肺炎': {
-                'severity': 'severe',
-                'duration_days': 21,
-                'health_penalty': 40,
-                'stamina_penalty': 50,
-                'contagious': False,
-                'treatment_cost': 800
-            },
-            '胃腸炎': {
-                'severity': 'moderate',
-                'duration_days': 5,
-                'health_penalty': 20,
-                'stamina_penalty': 30,
-                'contagious': True,
-                'treatment_cost': 200
-            },
-            '憂鬱症': {
-                'severity': 'moderate',
-                'duration_days': 30,
-                'mental_penalty': 30,
-                'happiness_penalty': 25,
-                'contagious': False,
-                'treatment_cost': 500
-            },
-            '焦慮症': {
-                'severity': 'mild',
-                'duration_days': 20,
-                'mental_penalty': 20,
-                'happiness_penalty': 15,
-                'contagious': False,
-                'treatment_cost': 350
-            },
-            '慢性疲勞': {
-                'severity': 'moderate',
-                'duration_days': 45,
-                'stamina_penalty': 25,
-                'health_penalty': 10,
-                'contagious': False,
-                'treatment_cost': 600
-        }
-
-        }
-        # 可供交易的基金目錄：每檔包含股票權重（以股票代碼為鍵，權重總和為1），與手續費率（單邊）
-        self.funds_catalog = {
-            '台灣科技ETF': {
-                'weights': {'TSMC': 0.5, 'HONHAI': 0.3, 'MTK': 0.2},
-                'fee_rate': 0.002
-            },
-            '服務業綜合ETF': {
-                'weights': {'RETAIL': 0.34, 'RESTAURANT': 0.33, 'TRAVEL': 0.33},
-                'fee_rate': 0.002
-            },
-            '一級產業ETF': {
-                'weights': {'MINING': 0.34, 'FARM': 0.33, 'FOREST': 0.33},
-                'fee_rate': 0.002
-            }
-        }
         # 持有的基金資訊：每檔包含 nav、units（持有單位）、total_cost、history（nav 歷史）、base_prices（初始化時的股票基準價）
+        # base_prices 先留空，由 _build_fund_vectors() 在整理係數時一併以現價補上
         self.funds = {}
-        for fname, finfo in self.funds_catalog.items():
-            base_prices = {code: self.stocks[code]['price'] for code in finfo['weights'].keys() if code in self.stocks}
+        for fname in self.funds_catalog:
             self.funds[fname] = {
                 'nav': 100.0,
                 'units': 0.0,
                 'total_cost': 0.0,
                 'history': [100.0],
-                'base_prices': base_prices,
+                'base_prices': {},
             }
+        self._build_fund_vectors()
+        # --- Auto-Invest / Entrepreneurship ---
+        self.dca_stocks = {}
+        self.dca_funds = {}
+        self.businesses = []
+        # 季節系統
+        self.current_season = 'spring'
+        self.season_duration_days = 90  # 每個季節持續90天
+        self.day_of_season = 0
+        self.current_weather = 'sunny'
+        self.weather_duration = 0
 
-    def save(self, file_path, show_error=None):
-        """儲存遊戲資料到檔案"""
+    def _build_industry_index(self):
+        """建立 產業 -> 股票代碼 tuple 的索引，事件依產業挑股票時不必掃描全部股票"""
+        index = {}
+        for code, stock in self.stocks.items():
+            index.setdefault(stock.get('industry', '未知'), []).append(code)
+        self.industry_codes = {industry: tuple(codes) for industry, codes in index.items()}
+
+    @property
+    def current_illness_names(self):
+        """當前疾病名稱集合（不寫入存檔）；第一次讀取時由 current_illnesses 建立，之後由健康系統就地增刪
+
+        快取不是 set 時（例如伺服器以 json 直接往返 __dict__ 後變成字串）一律重建
+        """
+        names = self._illness_names
+        if not isinstance(names, set):
+            names = self._illness_names = {illness['name'] for illness in self.current_illnesses}
+        return names
+
+    def _build_fund_vectors(self):
+        """預先整理每檔基金的成分股代碼與「權重 / 基準價」係數（平行 tuple），NAV 即為係數與現價的內積"""
+        self.fund_vectors = {}
+        for fname, finfo in self.funds_catalog.items():
+            base_prices = self.funds.get(fname, {}).setdefault('base_prices', {})
+            codes = []
+            coefs = []
+            for code, w in finfo['weights'].items():
+                if code not in self.stocks:
+                    continue
+                base = float(base_prices.get(code, 0.0))
+                if base <= 0:
+                    # 缺少基準價時以當前股價補上，避免除以零
+                    price = float(self.stocks[code]['price'])
+                    base = price if price > 0 else 1.0
+                    base_prices[code] = base
+                codes.append(code)
+                coefs.append(w / base)
+            self.fund_vectors[fname] = (tuple(codes), tuple(coefs))
+
+    def save(self, file_path, show_error=None, durable=False):
+        """儲存遊戲資料到檔案
+
+        存檔只供程式讀取，輸出精簡格式並以 gzip（level 1）壓縮。
+        副檔名為 .msave 時改以 MessagePack 二進位格式寫入（需安裝 msgpack）。
+        durable=True 時在替換前 fsync，供玩家手動存檔等需要確實落盤的情境。
+        """
         try:
             # 嘗試匯出成就資料
             if hasattr(self, 'achievements_manager') and self.achievements_manager:
@@ -516,15 +876,34 @@ class GameData:
                         self.achievements_unlocked = []
                     logging.warning(f"成就資料匯出失敗: {e}")
 
-            # 準備要儲存的資料，排除 achievements_manager 物件
-            data = {k: v for k, v in self.__dict__.items() if k != 'achievements_manager'}
+            self.trim_histories()
+            data = self._save_payload()
 
             # 確保資料夾存在
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            dir_name = os.path.dirname(file_path)
+            if dir_name:
+                os.makedirs(dir_name, exist_ok=True)
 
-            # 嘗試儲存檔案
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+            if file_path.endswith(BINARY_SAVE_EXT):
+                raw = _pack_binary(data)
+            else:
+                raw = gzip.compress(_dumps(data), compresslevel=1)
+            # 先寫暫存檔再原子替換，寫到一半中斷也不會毀掉舊存檔
+            tmp_path = file_path + '.tmp'
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(raw)
+                    if durable:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                # 寫入或替換失敗時清掉暫存檔，不留下半成品
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
 
             logging.info(f"遊戲已成功儲存到: {file_path}")
             return True
@@ -551,247 +930,60 @@ class GameData:
             return False
 
 
+    def trim_histories(self):
+        """就地裁切過長的歷史紀錄；股票買賣點的索引跟著價格歷史位移"""
+        for key in LOG_HISTORY_FIELDS:
+            log = getattr(self, key, None)
+            if isinstance(log, list) and len(log) > MAX_LOG_HISTORY:
+                del log[:-MAX_LOG_HISTORY]
+        for stock in self.stocks.values():
+            self._trim_stock_history(stock)
+        for fund in getattr(self, 'funds', {}).values():
+            history = fund.get('history')
+            if isinstance(history, list) and len(history) > MAX_PRICE_HISTORY:
+                del history[:-MAX_PRICE_HISTORY]
+
+    @staticmethod
+    def _trim_stock_history(stock, keep=MAX_PRICE_HISTORY):
+        """裁切單檔股票的價格歷史，只保留最後 keep 筆"""
+        history = stock['history']
+        excess = len(history) - keep
+        if excess > 0:
+            del history[:excess]
+            for key in ('buy_points', 'sell_points'):
+                stock[key] = [(i - excess, p) for i, p in stock.get(key, []) if i >= excess]
+
+    def record_price(self, stock, price):
+        """寫入新價格並追加歷史；超過兩倍上限才裁切一次，攤提後每筆 O(1)"""
+        stock['price'] = price
+        history = stock['history']
+        history.append(price)
+        if len(history) > 2 * MAX_PRICE_HISTORY:
+            self._trim_stock_history(stock)
+
+    def record_log(self, key, entry):
+        """追加一筆歷史紀錄；超過兩倍上限才裁切一次，讓兩次存檔之間的記憶體也維持有界"""
+        log = getattr(self, key)
+        log.append(entry)
+        if len(log) > 2 * MAX_LOG_HISTORY:
+            del log[:-MAX_LOG_HISTORY]
+
+    def record_fund_nav(self, fund, nav):
+        """寫入基金淨值並追加歷史，裁切方式同 record_price"""
+        fund['nav'] = nav
+        history = fund.setdefault('history', [])
+        history.append(nav)
+        if len(history) > 2 * MAX_PRICE_HISTORY:
+            del history[:-MAX_PRICE_HISTORY]
+
+    def _save_payload(self):
+        """建立要寫入存檔的資料，排除執行期物件與靜態目錄"""
+        skip = self._TRANSIENT_KEYS | self._STATIC_KEYS
+        return {k: v for k, v in self.__dict__.items() if k not in skip}
+
     def load(self, file_path, show_error=None):
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            self.__dict__.update(data)
-            # 自動補齊新版欄位
-            if not hasattr(self, 'reborn_count'):
-                self.reborn_count = 0
-            if not hasattr(self, 'btc_balance'):
-                self.btc_balance = 0.0
-            if not hasattr(self, 'btc_miner_count'):
-                self.btc_miner_count = 0
-            if not hasattr(self, 'btc_hashrate'):
-                self.btc_hashrate = 0.0
-            if 'BTC' not in self.stocks:
-                self.stocks['BTC'] = {'name': '比特幣', 'industry': '虛擬貨幣', 'price': 1000000, 'owned': 0, 'total_cost': 0, 'history': [1000000], 'buy_points': [], 'sell_points': [], 'dividend_per_share': 0, 'dividend_interval': 0, 'next_dividend_day': 0}
-            
-            # BUG FIX: industry_map 將服務業公司的產業別錯誤地設為其名稱，已修正。
-            industry_map = {
-                'TSMC': '科技業', 'HONHAI': '科技業', 'MTK': '科技業',
-                'MINING': '一級產業', 'FARM': '一級產業', 'FOREST': '一級產業',
-                'RETAIL': '服務業', 'RESTAURANT': '服務業', 'TRAVEL': '服務業',
-            }
-            for code, stock in self.stocks.items():
-                if 'industry' not in stock:
-                    stock['industry'] = industry_map.get(code, '未知')
-                if 'dividend_per_share' not in stock:
-                    stock['dividend_per_share'] = 1
-                if 'dividend_interval' not in stock:
-                    stock['dividend_interval'] = 30
-                if 'next_dividend_day' not in stock:
-                    stock['next_dividend_day'] = 30
-                # 確保舊存檔也有 buy_points 和 sell_points
-            
-            # 確保消耗品相關欄位存在
-            if not hasattr(self, 'consumables'):
-                # 這裡的初始值會由 reset() 方法設置
-                self.consumables = {}
-                
-            if not hasattr(self, 'inventory'):
-                self.inventory = {}
-                
-            if not hasattr(self, 'active_buffs'):
-                self.active_buffs = []
-                
-            if not hasattr(self, 'difficulty_levels'):
-                self.difficulty_levels = {
-                    'easy': {'salary_multiplier': 1.2, 'expense_multiplier': 0.8},
-                    'normal': {'salary_multiplier': 1.0, 'expense_multiplier': 1.0},
-                    'hard': {'salary_multiplier': 0.8, 'expense_multiplier': 1.2}
-                }
-                
-            if not hasattr(self, 'current_difficulty'):
-                self.current_difficulty = 'normal'
-                if 'buy_points' not in stock:
-                    stock['buy_points'] = []
-                if 'sell_points' not in stock:
-                    stock['sell_points'] = []
-                if 'drip' not in stock:
-                    stock['drip'] = False
-
-            # 補齊新加入的 btc 參數
-            if not hasattr(self, 'btc_mining_rate_per_kh'):
-                self.btc_mining_rate_per_kh = 0.001
-            if not hasattr(self, 'btc_price_volatility_sigma'):
-                self.btc_price_volatility_sigma = 0.003
-
-            # --- 補齊 Work Mode 欄位 ---
-            if not hasattr(self, 'job'):
-                self.job = None
-            # 公司選擇與目錄
-            if not hasattr(self, 'companies_catalog'):
-                self.companies_catalog = {
-                    '一般公司': {'salary_multiplier': 1.00},
-                    '宇宙科技': {'salary_multiplier': 1.10},
-                    '幸福生活': {'salary_multiplier': 0.95},
-                }
-            if not hasattr(self, 'current_company'):
-                self.current_company = '一般公司'
-            if not hasattr(self, 'income_history'):
-                self.income_history = []
-            # --- 補齊 Player attributes ---
-            if not hasattr(self, 'happiness'):
-                self.happiness = 50
-            if not hasattr(self, 'stamina'):
-                self.stamina = 50
-            # --- 新增擴充屬性：預設值補齊 ---
-            if not hasattr(self, 'intelligence'):
-                self.intelligence = 50
-            if not hasattr(self, 'diligence'):
-                self.diligence = 50
-            if not hasattr(self, 'charisma'):
-                self.charisma = 50
-            if not hasattr(self, 'experience'):
-                self.experience = 0
-            if not hasattr(self, 'luck_today'):
-                self.luck_today = 50
-            if not hasattr(self, 'last_luck_day'):
-                self.last_luck_day = -1
-            # --- 補齊 Education ---
-            if not hasattr(self, 'education_level'):
-                self.education_level = '高中'
-            if not hasattr(self, 'education_levels'):
-                self.education_levels = ['高中', '大學', '碩士', '博士']
-            if not hasattr(self, 'education_multipliers'):
-                self.education_multipliers = {
-                    '高中': 1.00,
-                    '大學': 1.10,
-                    '碩士': 1.25,
-                    '博士': 1.40,
-                }
-            if not hasattr(self, 'education_upgrade_cost'):
-                self.education_upgrade_cost = {
-                    '大學': 1000.0,
-                    '碩士': 3000.0,
-                    '博士': 8000.0,
-                }
-            if not hasattr(self, 'jobs_catalog'):
-                self.jobs_catalog = {
-                    '實習生': {'base_salary_per_day': 50.0, 'tax_rate': 0.05},
-                    '工程師': {'base_salary_per_day': 120.0, 'tax_rate': 0.10},
-                    '資深工程師': {'base_salary_per_day': 200.0, 'tax_rate': 0.12},
-                    '經理': {'base_salary_per_day': 300.0, 'tax_rate': 0.15},
-                }
-            # --- 補齊 Activities 欄位 ---
-            if not hasattr(self, 'activity_rules') or not isinstance(getattr(self, 'activity_rules', None), dict):
-                self.activity_rules = {
-                    'study': {'daily_max': 3, 'cooldown_days': 1},
-                    'workout': {'daily_max': 3, 'cooldown_days': 1},
-                    'social': {'daily_max': 3, 'cooldown_days': 1},
-                    'meditate': {'daily_max': 3, 'cooldown_days': 1},
-                }
-            # 狀態若不存在或格式錯誤則重建
-            if not hasattr(self, 'activity_state') or not isinstance(getattr(self, 'activity_state', None), dict):
-                self.activity_state = {}
-            # 同步 rules 與 state 的鍵與預設值
-            for k, rule in self.activity_rules.items():
-                st = self.activity_state.get(k)
-                if not isinstance(st, dict):
-                    st = {}
-                if 'remaining' not in st:
-                    st['remaining'] = int(rule.get('daily_max', 3))
-                if 'cd_left' not in st:
-                    st['cd_left'] = 0
-                self.activity_state[k] = st
-            # --- 補齊 Expenses 欄位 ---
-            if not hasattr(self, 'expenses'):
-                self.expenses = []
-            if not hasattr(self, 'expense_history'):
-                self.expense_history = []
-            if not hasattr(self, 'expense_defaults_added'):
-                self.expense_defaults_added = False
-            # --- 補齊 商店 與 物品欄 ---
-            if not hasattr(self, 'store_catalog'):
-                self.store_catalog = self._load_store_catalog_external()
-
-            if not hasattr(self, 'inventory'):
-                self.inventory = []
-            # --- 補齊 Funds/ETF 欄位 ---
-            if not hasattr(self, 'funds_catalog'):
-                self.funds_catalog = {
-                    '台灣科技ETF': {
-                        'weights': {'TSMC': 0.5, 'HONHAI': 0.3, 'MTK': 0.2},
-                        'fee_rate': 0.002
-                    },
-                    '服務業綜合ETF': {
-                        'weights': {'RETAIL': 0.34, 'RESTAURANT': 0.33, 'TRAVEL': 0.33},
-                        'fee_rate': 0.002
-                    },
-                    '一級產業ETF': {
-                        'weights': {'MINING': 0.34, 'FARM': 0.33, 'FOREST': 0.33},
-                        'fee_rate': 0.002
-                    },
-                }
-            if not hasattr(self, 'funds'):
-                self.funds = {}
-            # 補齊每檔基金必要欄位
-            for fname, finfo in self.funds_catalog.items():
-                if fname not in self.funds:
-                    self.funds[fname] = {}
-                f = self.funds[fname]
-                if 'nav' not in f:
-                    f['nav'] = 100.0
-                if 'units' not in f:
-                    f['units'] = 0.0
-                if 'total_cost' not in f:
-                    f['total_cost'] = 0.0
-                if 'history' not in f or not isinstance(f.get('history'), list):
-                    f['history'] = [f.get('nav', 100.0)]
-                # 基準價格若不存在，以當前股價建立，避免除以零
-                if 'base_prices' not in f or not f.get('base_prices'):
-                    f['base_prices'] = {code: self.stocks[code]['price'] for code in finfo['weights'].keys() if code in self.stocks}
-
-            # --- 補齊 Auto-Invest / Entrepreneurship 欄位 ---
-            if not hasattr(self, 'dca_stocks'):
-                self.dca_stocks = {}
-            if not hasattr(self, 'dca_funds'):
-                self.dca_funds = {}
-            if not hasattr(self, 'businesses'):
-                self.businesses = []
-
-            # 季節系統
-            self.seasons = ['spring', 'summer', 'autumn', 'winter']
-            self.current_season = 'spring'
-            self.season_duration_days = 90  # 每個季節持續90天
-            self.day_of_season = 0
-            self.weather_types = {
-                'sunny': {'name': '晴天', 'effect': {'happiness': 5, 'energy': 10}},
-                'cloudy': {'name': '陰天', 'effect': {'happiness': -2, 'energy': 5}},
-                'rainy': {'name': '雨天', 'effect': {'happiness': -5, 'energy': -5}},
-                'stormy': {'name': '暴風雨', 'effect': {'happiness': -10, 'energy': -15}},
-                'snowy': {'name': '雪天', 'effect': {'happiness': 5, 'energy': -10}}
-            }
-            self.current_weather = 'sunny'
-            self.weather_duration = 0
-            self.seasonal_activities = {
-                'spring': {
-                    'name': '春天',
-                    'activities': ['賞花', '踏青', '植樹', '春遊'],
-                    'effects': {'happiness': 10, 'health': 5},
-                    'special_events': ['櫻花季', '春雨綿綿']
-                },
-                'summer': {
-                    'name': '夏天',
-                    'activities': ['游泳', '度假', '吃冰', '避暑'],
-                    'effects': {'happiness': 8, 'stamina': -10},
-                    'special_events': ['暑假旅行', '海灘派對']
-                },
-                'autumn': {
-                    'name': '秋天',
-                    'activities': ['賞楓', '秋遊', '採果', '賞月'],
-                    'effects': {'happiness': 12, 'intelligence': 5},
-                    'special_events': ['中秋節', '楓葉季']
-                },
-                'winter': {
-                    'name': '冬天',
-                    'activities': ['賞雪', '溫泉', '滑雪', '圍爐'],
-                    'effects': {'happiness': 6, 'stamina': -5},
-                    'special_events': ['聖誕節', '跨年活動']
-                }
-            }
+            self.apply_save_data(_read_save_file(file_path))
 
             if hasattr(self, 'achievements_manager'):
                 self.achievements_manager.__init__(self, self.achievements_unlocked) # 重新初始化成就管理器
@@ -801,61 +993,156 @@ class GameData:
             else:
                 logging.error(f"讀檔失敗：{e}")
 
-    def _load_store_catalog_external(self):
+    def apply_save_data(self, data):
+        """套用已解析的存檔資料，依序執行各項舊存檔升級並重建執行期索引"""
+        # 先以 reset() 鋪好預設值與靜態目錄，再套用存檔中的動態欄位；
+        # 舊版存檔缺少的欄位自然保留預設值，不需逐一 hasattr 補齊
+        self.reset()
+        numeric_defaults = {key: self.__dict__[key] for key in NUMERIC_FIELDS}
+        self.__dict__.update({k: v for k, v in data.items() if k not in self._STATIC_KEYS})
+        self._migrate_stocks()
+        self._migrate_player(numeric_defaults)
+        self._migrate_consumable_state(data)
+        self._migrate_activities()
+        self._migrate_funds()
+        self._intern_strings()
+        self._build_industry_index()
+        self._build_fund_vectors()
+        self._rebuild_buff_totals()
+        # current_illnesses 已換成存檔內容，疾病名稱快取作廢
+        self._illness_names = None
+
+    def _migrate_stocks(self):
+        """補回缺少的 BTC，並逐檔補齊舊存檔缺少的股票欄位"""
+        if 'BTC' not in self.stocks:
+            self.stocks['BTC'] = _fresh_stock('BTC')
+        for code, stock in self.stocks.items():
+            _upgrade_stock_schema(code, stock)
+
+    def _migrate_player(self, defaults):
+        """JSON 會把 1.0 之類的浮點數存成整數，統一轉回 float 避免後續混合運算；
+        存檔中的值是 None 或非數字字串時改用 reset() 的預設值，不讓整個讀檔失敗"""
+        for key, default in defaults.items():
+            try:
+                self.__dict__[key] = float(self.__dict__[key])
+            except (TypeError, ValueError):
+                self.__dict__[key] = float(default)
+
+    def _migrate_activities(self):
+        """狀態若格式錯誤則重建，並同步 rules 與 state 的鍵與預設值"""
+        if not isinstance(self.activity_state, dict):
+            self.activity_state = {}
+        for k, rule in self.activity_rules.items():
+            st = self.activity_state.get(k)
+            if not isinstance(st, dict):
+                st = {}
+            st.setdefault('remaining', int(rule.get('daily_max', 3)))
+            st.setdefault('cd_left', 0)
+            self.activity_state[k] = st
+
+    def _migrate_funds(self):
+        """補齊每檔基金必要欄位"""
+        for fname in self.funds_catalog:
+            f = self.funds.setdefault(fname, {})
+            for key, default in FUND_DEFAULTS:
+                f.setdefault(key, default)
+            if not isinstance(f.get('history'), list):
+                f['history'] = [f.get('nav', 100.0)]
+            # 缺少的基準價格由 _build_fund_vectors() 以當前股價補上，避免除以零
+            if not isinstance(f.get('base_prices'), dict):
+                f['base_prices'] = {}
+
+    def _intern_strings(self):
+        """讀檔後把常用作字典鍵或比對的字串 intern，與程式內常值共用同一物件"""
+        self.stocks = {sys.intern(code): stock for code, stock in self.stocks.items()}
+        for stock in self.stocks.values():
+            if isinstance(stock.get('industry'), str):
+                stock['industry'] = sys.intern(stock['industry'])
+        self.activity_state = {sys.intern(k): v for k, v in self.activity_state.items()}
+        self.economic_cycles = {sys.intern(k): v for k, v in self.economic_cycles.items()}
+        for cycle in self.economic_cycles.values():
+            if isinstance(cycle.get('phase'), str):
+                cycle['phase'] = sys.intern(cycle['phase'])
+        for buff in self.active_buffs:
+            if isinstance(buff.get('stat'), str):
+                buff['stat'] = sys.intern(buff['stat'])
+        for key in LOG_HISTORY_FIELDS:
+            for entry in self.__dict__.get(key) or ():
+                if not isinstance(entry, dict):
+                    continue
+                for field in LOG_VOCAB_KEYS:
+                    value = entry.get(field)
+                    if isinstance(value, str):
+                        entry[field] = sys.intern(value)
+        for key in INTERNED_FIELDS:
+            value = self.__dict__.get(key)
+            if isinstance(value, str):
+                self.__dict__[key] = sys.intern(value)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _load_store_catalog_external():
         # 從專案根目錄的 data/store_catalog.json 載入，失敗則回退到內建預設
+        # 每個行程只解析一次；回傳的目錄為各實例共用，呼叫端不應修改
+        if not os.path.exists(CATALOG_PATH):
+            return _DEFAULT_STORE_CATALOG
         try:
-            # modules/ 在上一層建立 data/
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            data_path = os.path.join(base_dir, 'data')
-            os.makedirs(data_path, exist_ok=True)
-            catalog_path = os.path.join(data_path, 'store_catalog.json')
-            if os.path.exists(catalog_path):
-                with open(catalog_path, 'r', encoding='utf-8') as f:
-                    cat = json.load(f)
-                if isinstance(cat, dict) and 'subscriptions' in cat and 'goods' in cat:
-                    return cat
+            with open(CATALOG_PATH, 'r', encoding='utf-8') as f:
+                cat = json.load(f)
         except Exception:
-            pass
-        # 內建預設
-        return {
-            'subscriptions': {
-                'Netflix 訂閱': {'price': 0.0, 'type': 'subscription', 'amount': 15.0, 'frequency': 'monthly'},
-                'Spotify 訂閱': {'price': 0.0, 'type': 'subscription', 'amount': 10.0, 'frequency': 'monthly'},
-                '健身房會員': {'price': 0.0, 'type': 'subscription', 'amount': 30.0, 'frequency': 'monthly'},
-            },
-            'goods': {
-                '筆電': {'price': 800.0, 'type': 'goods'},
-                '自行車': {'price': 150.0, 'type': 'goods'},
-            }
-        }
+            return _DEFAULT_STORE_CATALOG
+        if isinstance(cat, dict) and 'subscriptions' in cat and 'goods' in cat:
+            return cat
+        return _DEFAULT_STORE_CATALOG
 
-    def total_assets(self):
-        return self.balance + self.cash - self.loan
-        
     def can_afford(self, amount):
         """檢查現金是否足夠支付指定金額"""
         return self.cash >= amount
         
     def add_item(self, item_id, quantity=1):
         """添加物品到庫存"""
-        if item_id in self.inventory:
-            self.inventory[item_id] += quantity
-        else:
-            self.inventory[item_id] = quantity
-        return self.inventory[item_id]
+        count = self.inventory.get(item_id, 0) + quantity
+        self.inventory[item_id] = count
+        return count
         
     def remove_item(self, item_id, quantity=1):
         """從庫存中移除物品"""
-        if item_id not in self.inventory or self.inventory[item_id] < quantity:
+        count = self.inventory.get(item_id, 0)
+        if count < quantity:
             return False
-        self.inventory[item_id] -= quantity
-        if self.inventory[item_id] <= 0:
-            del self.inventory[item_id]
+        count -= quantity
+        if count > 0:
+            self.inventory[item_id] = count
+        else:
+            self.inventory.pop(item_id, None)
         return True
         
     def has_item(self, item_id, quantity=1):
         """檢查是否擁有足夠數量的物品"""
-        return item_id in self.inventory and self.inventory[item_id] >= quantity
+        return self.inventory.get(item_id, 0) >= quantity
+
+    def _migrate_consumable_state(self, data):
+        """讀檔後整理消耗品購買計數；舊版存檔把 daily_bought 放在消耗品定義裡，讀檔時搬到 consumable_state"""
+        state = data.get('consumable_state')
+        if not isinstance(state, dict):
+            old_defs = data.get('consumables')
+            if not isinstance(old_defs, dict):
+                old_defs = {}
+            state = {item_id: {'daily_bought': int(item.get('daily_bought', 0))}
+                     for item_id, item in old_defs.items() if isinstance(item, dict)}
+        for item_id in self.consumables:
+            state.setdefault(item_id, {'daily_bought': 0})
+        self.consumable_state = state
+
+    def get_daily_bought(self, item_id):
+        """回傳消耗品今日已購買的數量"""
+        entry = self.consumable_state.get(item_id)
+        return entry['daily_bought'] if entry else 0
+
+    def reset_daily_purchases(self):
+        """每日換日時清零所有消耗品的今日購買數"""
+        for entry in self.consumable_state.values():
+            entry['daily_bought'] = 0
         
     def buy_consumable(self, item_id, quantity=1):
         """購買消耗品"""
@@ -870,13 +1157,14 @@ class GameData:
             return False, "現金不足"
             
         # 檢查每日限購
-        if item['daily_bought'] + quantity > item['daily_limit']:
-            return False, f"已達每日限購數量 (今日還可購買 {item['daily_limit'] - item['daily_bought']} 個)"
+        entry = self.consumable_state.setdefault(item_id, {'daily_bought': 0})
+        if entry['daily_bought'] + quantity > item['daily_limit']:
+            return False, f"已達每日限購數量 (今日還可購買 {item['daily_limit'] - entry['daily_bought']} 個)"
             
         # 扣錢並增加物品
         self.cash -= total_cost
         self.add_item(item_id, quantity)
-        item['daily_bought'] += quantity
+        entry['daily_bought'] += quantity
         
         return True, f"成功購買 {quantity} 個 {item['name']}"
         
@@ -918,117 +1206,117 @@ class GameData:
             'applied_at': 0,  # 會在 unified_timer 中更新
             'description': description
         })
+        self.buff_totals[stat] = self.buff_totals.get(stat, 0.0) + value
         
     def get_buff_value(self, stat):
         """獲取指定屬性的buff加成總和"""
-        total = 0.0
+        return self.buff_totals.get(stat, 0.0)
+
+    def _rebuild_buff_totals(self):
+        """依 active_buffs 重算各屬性加成總和"""
+        totals = {}
         for buff in self.active_buffs:
-            if buff['stat'] == stat:
-                total += buff['value']
-        return total
+            totals[buff['stat']] = totals.get(buff['stat'], 0.0) + buff['value']
+        self.buff_totals = totals
         
     def update_buffs(self, minutes_passed=1):
-        """更新buff持續時間，返回過期的buff列表"""
+        """更新buff持續時間，返回過期的buff列表（沒有任何 buff 時為空 tuple）"""
         if not hasattr(self, 'active_buffs'):
             self.active_buffs = []
             return []
+        # 大多數時間沒有任何 buff：直接返回，不走訪也不配置列表
+        if not self.active_buffs:
+            return ()
             
         expired = []
-        remaining = []
-        
         for buff in self.active_buffs:
-            buff['duration'] = max(0, buff['duration'] - minutes_passed)
-            if buff['duration'] <= 0:
+            # 每個 buff 只讀寫一次 duration，歸零時順便記為過期
+            remaining = buff['duration'] - minutes_passed
+            if remaining <= 0:
+                remaining = 0
                 expired.append(buff)
-            else:
-                remaining.append(buff)
+            buff['duration'] = remaining
                 
-        self.active_buffs = remaining
+        if expired:
+            # 只有在效果結束時才就地移除並重算總和（避免浮點累減誤差），平常不重建列表
+            self.active_buffs[:] = [buff for buff in self.active_buffs if buff['duration'] > 0]
+            self._rebuild_buff_totals()
         return expired
 
+    def get_difficulty_multiplier(self, key):
+        """取得目前難度下指定項目的倍率，未定義時為 1.0"""
+        return self.difficulty_levels.get(self.current_difficulty, {}).get(key, 1.0)
+
     def is_valid(self):
         return self.balance is not None and self.cash is not None
 
     def total_assets(self):
-        # 計算普通股票的市值
-        stock_value = sum(s['price'] * s['owned'] for s in self.stocks.values() if s['name'] != '比特幣')
+        stocks = self.stocks
+        # 計算普通股票的市值（BTC 另以 btc_balance 計價）
+        stock_value = sum(s['price'] * s['owned'] for code, s in stocks.items() if code != 'BTC')
 
         # 計算比特幣的市值
-        btc_price = self.stocks['BTC']['price']
-        btc_market_value = self.btc_balance * btc_price
+        btc_market_value = self.btc_balance * stocks['BTC']['price']
 
         # 總資產 = 銀行存款 + 現金 + 普通股票市值 + 比特幣市值 - 貸款
         return self.balance + self.cash + stock_value + btc_market_value - self.loan
     
     def update_economic_cycles(self):
         """更新所有產業的景氣循環"""
-        import random
+        # 迴圈內只用到這兩個值，先綁成區域變數
+        transition_prob = self.cycle_transition_prob
+        rand = random.random
         for industry, cycle in self.economic_cycles.items():
             cycle['duration'] += 1
+            # 每段景氣的最長天數在進入該階段時抽一次；新遊戲與舊存檔首次使用時補抽
+            max_duration = cycle.get('max_duration')
+            if max_duration is None:
+                max_duration = cycle['max_duration'] = self._get_max_duration(cycle['phase'])
             
             # 檢查是否需要轉換階段
-            if random.random() < self.cycle_transition_prob:
-                self._transition_cycle(industry)
-            elif cycle['duration'] > self._get_max_duration(cycle['phase']):
+            if rand() < transition_prob or cycle['duration'] > max_duration:
                 self._transition_cycle(industry)
                 
-            # 根據當前階段調整經濟指標
-            self._update_cycle_effects(industry)
+        # 根據各產業當前階段調整股價（所有股票一次走訪）
+        self._update_cycle_effects()
     
     def _transition_cycle(self, industry):
         """轉換指定產業的景氣階段"""
-        import random
         cycle = self.economic_cycles[industry]
-        current_phase = cycle['phase']
-        
-        # 階段轉換邏輯
-        if current_phase == 'normal':
-            # 正常時期可以轉向榮景或衰退
-            if random.random() < 0.4:
-                new_phase = 'boom'
-            else:
-                new_phase = 'recession'
-        elif current_phase == 'boom':
-            # 榮景後通常進入正常
-            new_phase = 'normal'
-        else:  # recession
-            # 衰退後通常進入正常
-            new_phase = 'normal'
+        # 正常時期 40% 轉向榮景、其餘轉向衰退；榮景與衰退後都回到正常
+        choices = _NEXT_PHASE.get(cycle['phase'], _NEXT_PHASE['recession'])
+        new_phase = choices[0] if random.random() < 0.4 else choices[1]
             
         cycle['phase'] = new_phase
         cycle['duration'] = 0
+        cycle['max_duration'] = self._get_max_duration(new_phase)
         
         # 設定新階段的經濟指標
-        if new_phase == 'boom':
-            cycle['strength'] = random.uniform(1.2, 1.5)
-            cycle['volatility'] = random.uniform(0.015, 0.025)
-        elif new_phase == 'recession':
-            cycle['strength'] = random.uniform(0.6, 0.8)
-            cycle['volatility'] = random.uniform(0.02, 0.035)
-        else:  # normal
-            cycle['strength'] = 1.0
-            cycle['volatility'] = 0.01
+        (s_lo, s_hi), (v_lo, v_hi) = _PHASE_PARAMS[new_phase]
+        cycle['strength'] = random.uniform(s_lo, s_hi)
+        cycle['volatility'] = random.uniform(v_lo, v_hi)
     
     def _get_max_duration(self, phase):
         """獲取指定階段的最大持續時間"""
-        import random
         min_d, max_d = self.cycle_duration_range[phase]
         return random.randint(min_d, max_d)
     
-    def _update_cycle_effects(self, industry):
-        """更新指定產業的景氣效果"""
-        cycle = self.economic_cycles[industry]
-        strength = cycle['strength']
-        
-        # 應用到相關股票
-        for code, stock in self.stocks.items():
-            if stock.get('industry') == industry:
-                # 根據景氣強度調整股價
-                volatility = cycle['volatility']
-                change = random.gauss(strength - 1.0, volatility)
-                stock['price'] *= (1 + change)
-                stock['price'] = max(10, round(stock['price'], 2))
-                stock['history'].append(stock['price'])
+    def _update_cycle_effects(self):
+        """依所屬產業的景氣強度與波動調整每檔股票價格"""
+        # 各產業的 (平均漲跌, 波動) 先算好，迴圈內只查一次字典
+        params = {industry: (cycle['strength'] - 1.0, cycle['volatility'])
+                  for industry, cycle in self.economic_cycles.items()}
+        gauss = random.gauss
+        record_price = self.record_price
+        for stock in self.stocks.values():
+            p = params.get(stock.get('industry'))
+            if p is None:
+                continue
+            # 根據景氣強度調整股價（歷史長度由 record_price 控制）
+            price = round(stock['price'] * (1.0 + gauss(p[0], p[1])), 2)
+            if price < 10:
+                price = 10
+            record_price(stock, price)
     
     def get_cycle_info(self, industry):
         """獲取指定產業的景氣資訊"""
@@ -1039,9 +1327,5 @@ class GameData:
             'phase': cycle['phase'],
             'strength': cycle['strength'],
             'duration': cycle['duration'],
-            'phase_text': {
-                'boom': '榮景',
-                'normal': '正常',
-                'recession': '衰退'
-            }.get(cycle['phase'], '未知')
+            'phase_text': _PHASE_TEXT.get(cycle['phase'], '未知')
         }
\ No newline at end of file
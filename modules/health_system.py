@@ -1,22 +1,45 @@
 import random
-import tkinter as tk
-from tkinter import ttk, messagebox
+from bisect import bisect
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from bank_game import BankGame
 
+# 傳染性疾病每次抽樣有 30% 機會遇上流行季節，該次權重加倍
+EPIDEMIC_SEASON_CHANCE = 0.3
+EPIDEMIC_SEASON_MULTIPLIER = 2.0
+
+# 計入每日運動量的健康活動
+EXERCISE_ACTIVITIES = frozenset({'輕度運動', '中度運動', '劇烈運動'})
+
+# 隨機健康事件：(名稱, 描述, 觸發時呼叫的 HealthSystem 方法名)
+HEALTH_EVENTS = (
+    ('健康檢查提醒', '醫生建議進行定期健康檢查', '_health_check_reminder'),
+    ('營養專家建議', '收到營養師的飲食建議', '_nutrition_advice'),
+    ('健身動機提升', '看到健身成功案例，獲得運動動機', '_fitness_motivation'),
+    ('壓力管理課程', '免費壓力管理課程機會', '_stress_management'),
+)
+
 class HealthSystem:
     """健康系統管理器"""
 
     def __init__(self, game: 'BankGame'):
         self.game = game
+        # 每個實例專用的亂數產生器；可個別 seed 以重播，不影響其他實例或全域 random
+        self._rng = random.Random()
+        # 疾病抽樣表快取：(疾病名稱, 含抗性的基礎權重, 是否傳染) 三個 tuple；抗性變動或讀檔換了字典才重建
+        # 累積權重因流行季節每次抽樣各自擲骰，於 _contract_random_disease 中逐次建立
+        self._disease_sampler = None
+        self._sampler_resistance = None
+        # 疾病數值快取：{名稱: (健康懲罰, 體力懲罰, 心理懲罰, 快樂懲罰, 恢復期每日健康懲罰)}
+        self._disease_vectors = None
+        self._vectors_source = None
 
     def update_daily_health(self):
         """每日健康更新"""
         # 隨機疾病機率
         disease_chance = self._calculate_disease_risk()
-        if random.random() < disease_chance:
+        if self._rng.random() < disease_chance:
             self._contract_random_disease()
 
         # 更新現有疾病
@@ -30,61 +53,88 @@ class HealthSystem:
 
     def _calculate_disease_risk(self):
         """計算疾病風險"""
+        data = self.game.data
         base_risk = 0.05  # 基礎風險 5%
 
         # 年齡因子（遊戲天數）
-        age_factor = min(self.game.data.days / 3650, 2.0)  # 最高2倍風險
+        age_factor = min(data.days / 3650, 2.0)  # 最高2倍風險
 
         # 健康狀態因子
-        health_factor = (100 - self.game.data.health_status) / 100.0
+        health_factor = (100 - data.health_status) / 100.0
 
         # 免疫系統因子
-        immune_factor = (100 - self.game.data.immune_system) / 100.0
+        immune_factor = (100 - data.immune_system) / 100.0
 
         # 生活方式因子
         lifestyle_factor = 0
-        if self.game.data.daily_exercise < 30:  # 每日運動少於30分鐘
+        if data.daily_exercise < 30:  # 每日運動少於30分鐘
             lifestyle_factor += 0.02
-        if self.game.data.sleep_quality < 70:
+        if data.sleep_quality < 70:
             lifestyle_factor += 0.02
-        if self.game.data.diet_quality < 70:
+        if data.diet_quality < 70:
             lifestyle_factor += 0.02
 
         total_risk = base_risk * (1 + age_factor + health_factor + immune_factor + lifestyle_factor)
         return min(total_risk, 0.3)  # 最高30%風險
 
+    def _get_disease_sampler(self):
+        """取得疾病抽樣表：(名稱, 含抗性的基礎權重, 是否傳染)；疾病目錄固定，只有抗性改變時才需重算"""
+        resistances = self.game.data.illness_resistance
+        if self._disease_sampler is None or self._sampler_resistance is not resistances:
+            names = []
+            weights = []
+            contagious = []
+            for disease_name, disease in self.game.data.disease_types.items():
+                weight = 1.0
+                # 免疫抗性
+                if disease_name in resistances:
+                    weight *= max(0.1, 1.0 - resistances[disease_name])
+                names.append(disease_name)
+                weights.append(weight)
+                contagious.append(bool(disease['contagious']))
+            self._disease_sampler = (tuple(names), tuple(weights), tuple(contagious))
+            self._sampler_resistance = resistances
+        return self._disease_sampler
+
+    def _get_disease_vectors(self):
+        """把疾病目錄整理成數值 tuple，每日套用效果時不必逐一檢查鍵是否存在"""
+        disease_types = self.game.data.disease_types
+        if self._vectors_source is not disease_types:
+            vectors = {}
+            for disease_name, disease in disease_types.items():
+                health_penalty = disease.get('health_penalty', 0)
+                vectors[disease_name] = (
+                    health_penalty,
+                    disease.get('stamina_penalty', 0),
+                    disease.get('mental_penalty', 0),
+                    disease.get('happiness_penalty', 0),
+                    health_penalty // 3,  # 恢復期間效果減弱
+                )
+            self._disease_vectors = vectors
+            self._vectors_source = disease_types
+        return self._disease_vectors
+
     def _contract_random_disease(self):
         """感染隨機疾病"""
-        available_diseases = list(self.game.data.disease_types.keys())
-
-        # 根據季節和健康狀態調整疾病機率
-        disease_weights = {}
-        for disease_name in available_diseases:
-            weight = 1.0
-            disease = self.game.data.disease_types[disease_name]
-
-            # 季節因子
-            if disease['contagious'] and random.random() < 0.3:  # 30%機會在流行季節
-                weight *= 2.0
-
-            # 免疫抗性
-            if disease_name in self.game.data.illness_resistance:
-                resistance = self.game.data.illness_resistance[disease_name]
-                weight *= max(0.1, 1.0 - resistance)
-
-            disease_weights[disease_name] = weight
-
-        # 選擇疾病
-        diseases = list(disease_weights.keys())
-        weights = list(disease_weights.values())
-        selected_disease = random.choices(diseases, weights=weights, k=1)[0]
+        names, weights, contagious = self._get_disease_sampler()
+        rand = self._rng.random
+
+        # 季節因子每次抽樣各自擲骰，再依累積權重二分搜尋選擇疾病
+        cum_weights = []
+        total = 0.0
+        for weight, is_contagious in zip(weights, contagious):
+            if is_contagious and rand() < EPIDEMIC_SEASON_CHANCE:
+                weight *= EPIDEMIC_SEASON_MULTIPLIER
+            total += weight
+            cum_weights.append(total)
+        selected_disease = names[bisect(cum_weights, rand() * total, 0, len(names) - 1)]
 
         # 感染疾病
         self._contract_disease(selected_disease)
 
     def _contract_disease(self, disease_name):
         """感染指定疾病"""
-        if disease_name in [d['name'] for d in self.game.data.current_illnesses]:
+        if disease_name in self.game.data.current_illness_names:
             return  # 已經感染此疾病
 
         disease = self.game.data.disease_types[disease_name]
@@ -98,6 +148,7 @@ class HealthSystem:
         }
 
         self.game.data.current_illnesses.append(illness_record)
+        self.game.data.current_illness_names.add(disease_name)
 
         # 立即應用疾病效果
         self._apply_disease_effects(disease_name)
@@ -114,51 +165,59 @@ class HealthSystem:
 
     def _apply_disease_effects(self, disease_name):
         """應用疾病效果"""
-        disease = self.game.data.disease_types[disease_name]
-
-        if 'health_penalty' in disease:
-            self.game.data.health_status = max(0, self.game.data.health_status - disease['health_penalty'])
-        if 'stamina_penalty' in disease:
-            self.game.data.stamina = max(0, self.game.data.stamina - disease['stamina_penalty'])
-        if 'mental_penalty' in disease:
-            self.game.data.mental_health = max(0, self.game.data.mental_health - disease['mental_penalty'])
-        if 'happiness_penalty' in disease:
-            self.game.data.happiness = max(0, self.game.data.happiness - disease['happiness_penalty'])
+        data = self.game.data
+        health_penalty, stamina_penalty, mental_penalty, happiness_penalty, _ = self._get_disease_vectors()[disease_name]
+
+        if health_penalty:
+            data.health_status = max(0, data.health_status - health_penalty)
+        if stamina_penalty:
+            data.stamina = max(0, data.stamina - stamina_penalty)
+        if mental_penalty:
+            data.mental_health = max(0, data.mental_health - mental_penalty)
+        if happiness_penalty:
+            data.happiness = max(0, data.happiness - happiness_penalty)
 
     def _update_diseases(self):
         """更新疾病狀態"""
-        remaining_illnesses = []
-
-        for illness in self.game.data.current_illnesses:
-            if self.game.data.days >= illness['end_day']:
+        data = self.game.data
+        illnesses = data.current_illnesses
+        vectors = self._get_disease_vectors()
+        today = data.days
+
+        # 就地壓縮：未痊癒的疾病往前搬，沒有疾病痊癒時不配置新列表
+        kept = 0
+        for illness in illnesses:
+            if today >= illness['end_day']:
                 # 疾病痊癒
                 self._cure_disease(illness)
             else:
-                remaining_illnesses.append(illness)
+                illnesses[kept] = illness
+                kept += 1
                 # 繼續應用疾病效果（較輕微）
-                disease = self.game.data.disease_types[illness['name']]
-                if 'health_penalty' in disease:
-                    penalty = disease['health_penalty'] // 3  # 恢復期間效果減弱
-                    self.game.data.health_status = max(0, self.game.data.health_status - penalty)
+                mild_penalty = vectors[illness['name']][4]
+                if mild_penalty:
+                    data.health_status = max(0, data.health_status - mild_penalty)
 
-        self.game.data.current_illnesses = remaining_illnesses
+        del illnesses[kept:]
 
     def _cure_disease(self, illness):
         """治癒疾病"""
         disease_name = illness['name']
-        disease = self.game.data.disease_types[disease_name]
+        health_penalty = self._get_disease_vectors()[disease_name][0]
+        self.game.data.current_illness_names.discard(disease_name)
 
         # 恢復部分健康
         recovery_rate = 0.7 if illness['treated'] else 0.5
 
-        if 'health_penalty' in disease:
-            recovery = int(disease['health_penalty'] * recovery_rate)
+        if health_penalty:
+            recovery = int(health_penalty * recovery_rate)
             self.game.data.health_status = min(100, self.game.data.health_status + recovery)
 
         # 增加免疫力
         if disease_name not in self.game.data.illness_resistance:
             self.game.data.illness_resistance[disease_name] = 0
         self.game.data.illness_resistance[disease_name] = min(1.0, self.game.data.illness_resistance[disease_name] + 0.1)
+        self._disease_sampler = None  # 抗性已變動，下次抽樣重建權重
 
         # 記錄治癒
         medical_record = {
@@ -223,7 +282,8 @@ class HealthSystem:
         activity = self.game.data.health_activities[activity_name]
 
         # 檢查體力
-        if self.game.data.stamina < activity.get('stamina_cost', 0):
+        stamina_cost = activity.get('stamina_cost', 0)
+        if self.game.data.stamina < stamina_cost:
             return False, "體力不足"
 
         # 檢查金錢（如果需要）
@@ -235,67 +295,81 @@ class HealthSystem:
         if cost > 0:
             self.game.data.cash -= cost
 
-        stamina_cost = activity.get('stamina_cost', 0)
         self.game.data.stamina = max(0, self.game.data.stamina - stamina_cost)
 
         # 應用效果
+        health_gain, mental_gain, stress_reduction, health_boost = self._apply_activity_effects(activity_name, activity)
         results = []
-        if 'health_gain' in activity:
-            gain = activity['health_gain']
-            self.game.data.health_status = min(100, self.game.data.health_status + gain)
-            results.append(f"健康 +{gain}")
-
-        if 'mental_gain' in activity:
-            gain = activity['mental_gain']
-            self.game.data.mental_health = min(100, self.game.data.mental_health + gain)
-            results.append(f"心理健康 +{gain}")
-
-        if 'stress_reduction' in activity:
-            reduction = activity['stress_reduction']
-            self.game.data.stress_level = max(0, self.game.data.stress_level - reduction)
-            results.append(f"壓力 -{reduction}")
-
-        if 'health_boost' in activity:
-            boost = activity['health_boost']
-            self.game.data.health_status = min(100, self.game.data.health_status + boost)
-            results.append(f"健康檢查：健康 +{boost}")
+        if health_gain:
+            results.append(f"健康 +{health_gain}")
+        if mental_gain:
+            results.append(f"心理健康 +{mental_gain}")
+        if stress_reduction:
+            results.append(f"壓力 -{stress_reduction}")
+        if health_boost:
+            results.append(f"健康檢查：健康 +{health_boost}")
+
+        return True, f"{activity.get('name', activity_name)}完成！效果：{', '.join(results)}"
+
+    def _apply_activity_effects(self, activity_name, activity):
+        """套用健康活動的數值效果（不組訊息），回傳 (健康, 心理, 減壓, 健檢加成) 實際設定值"""
+        data = self.game.data
+        health_gain = activity.get('health_gain', 0)
+        mental_gain = activity.get('mental_gain', 0)
+        stress_reduction = activity.get('stress_reduction', 0)
+        health_boost = activity.get('health_boost', 0)
+
+        if health_gain or health_boost:
+            data.health_status = min(100, data.health_status + health_gain + health_boost)
+        if mental_gain:
+            data.mental_health = min(100, data.mental_health + mental_gain)
+        if stress_reduction:
+            data.stress_level = max(0, data.stress_level - stress_reduction)
 
         # 更新健康指標
-        if activity_name in ['輕度運動', '中度運動', '劇烈運動']:
-            self.game.data.daily_exercise += activity.get('duration', 30)
+        if activity_name in EXERCISE_ACTIVITIES:
+            data.daily_exercise += activity.get('duration', 30)
 
-        return True, f"{activity['name']}完成！效果：{', '.join(results)}"
+        return health_gain, mental_gain, stress_reduction, health_boost
 
     def _update_health_indicators(self):
         """更新健康指標"""
+        data = self.game.data
         # 計算睡眠品質（基於壓力水平）
-        stress_factor = self.game.data.stress_level / 100.0
-        self.game.data.sleep_quality = max(20, 100 - (stress_factor * 50))
+        sleep_quality = 100 - data.stress_level * 0.5
 
         # 計算飲食品質（基於現金水平）
-        cash_factor = min(self.game.data.cash / 1000.0, 1.0)
-        self.game.data.diet_quality = max(30, 100 - (cash_factor * 30))
+        cash = data.cash
+        cash_factor = 1.0 if cash >= 1000 else cash * 0.001
+        diet_quality = 100 - cash_factor * 30
 
         # 更新免疫系統（基於健康狀態）
-        health_factor = self.game.data.health_status / 100.0
-        self.game.data.immune_system = min(100, max(20, self.game.data.immune_system + (health_factor - 0.5) * 2))
+        immune = data.immune_system + (data.health_status * 0.01 - 0.5) * 2
+
+        # 以條件式夾限後一次寫回，省去 min()/max() 呼叫
+        data.sleep_quality = sleep_quality if sleep_quality > 20 else 20
+        data.diet_quality = diet_quality if diet_quality > 30 else 30
+        data.immune_system = 100 if immune > 100 else (immune if immune > 20 else 20)
 
     def _natural_recovery(self):
         """自然恢復"""
+        data = self.game.data
+        # 小範圍整數以單次 random() 換算，省去 randint 的參數檢查與多層呼叫
+        rand = self._rng.random
         # 健康恢復
-        if self.game.data.health_status < 100:
-            recovery = random.randint(1, 3)
-            self.game.data.health_status = min(100, self.game.data.health_status + recovery)
+        if data.health_status < 100:
+            recovery = 1 + int(rand() * 3)
+            data.health_status = min(100, data.health_status + recovery)
 
         # 體力恢復
-        if self.game.data.stamina < 100:
-            recovery = random.randint(5, 15)
-            self.game.data.stamina = min(100, self.game.data.stamina + recovery)
+        if data.stamina < 100:
+            recovery = 5 + int(rand() * 11)
+            data.stamina = min(100, data.stamina + recovery)
 
         # 心理健康恢復
-        if self.game.data.mental_health < 100:
-            recovery = random.randint(1, 5)
-            self.game.data.mental_health = min(100, self.game.data.mental_health + recovery)
+        if data.mental_health < 100:
+            recovery = 1 + int(rand() * 5)
+            data.mental_health = min(100, data.mental_health + recovery)
 
     def get_health_summary(self):
         """獲取健康總結"""
@@ -327,66 +401,43 @@ class HealthSystem:
 
     def generate_health_event(self):
         """生成隨機健康事件"""
-        if random.random() < 0.1:  # 10% 機率
-            health_events = [
-                {
-                    'name': '健康檢查提醒',
-                    'description': '醫生建議進行定期健康檢查',
-                    'effect': lambda: self._health_check_reminder()
-                },
-                {
-                    'name': '營養專家建議',
-                    'description': '收到營養師的飲食建議',
-                    'effect': lambda: self._nutrition_advice()
-                },
-                {
-                    'name': '健身動機提升',
-                    'description': '看到健身成功案例，獲得運動動機',
-                    'effect': lambda: self._fitness_motivation()
-                },
-                {
-                    'name': '壓力管理課程',
-                    'description': '免費壓力管理課程機會',
-                    'effect': lambda: self._stress_management()
-                }
-            ]
-
-            event = random.choice(health_events)
-            return {
-                'type': 'health_event',
-                'name': event['name'],
-                'description': event['description'],
-                'effect_func': event['effect']
-            }
-
-        return None
+        if self._rng.random() >= 0.1:  # 10% 機率觸發，其餘直接返回
+            return None
+
+        name, description, method_name = HEALTH_EVENTS[self._rng.randrange(len(HEALTH_EVENTS))]
+        return {
+            'type': 'health_event',
+            'name': name,
+            'description': description,
+            'effect_func': getattr(self, method_name)
+        }
 
     def _health_check_reminder(self):
         """健康檢查提醒"""
         checkup_cost = 200
         if self.game.data.cash >= checkup_cost:
             self.game.data.cash -= checkup_cost
-            health_boost = random.randint(15, 25)
+            health_boost = self._rng.randint(15, 25)
             self.game.data.health_status = min(100, self.game.data.health_status + health_boost)
             return True, f"進行健康檢查，花費 ${checkup_cost}，健康 +{health_boost}"
         return True, "收到健康檢查提醒，但現金不足"
 
     def _nutrition_advice(self):
         """營養建議"""
-        diet_boost = random.randint(10, 20)
+        diet_boost = self._rng.randint(10, 20)
         self.game.data.diet_quality = min(100, self.game.data.diet_quality + diet_boost)
         return True, f"獲得營養建議，飲食品質提升 {diet_boost} 點"
 
     def _fitness_motivation(self):
         """健身動機"""
-        stamina_boost = random.randint(10, 20)
+        stamina_boost = self._rng.randint(10, 20)
         self.game.data.stamina = min(100, self.game.data.stamina + stamina_boost)
         return True, f"獲得健身動機，體力 +{stamina_boost}"
 
     def _stress_management(self):
         """壓力管理"""
-        stress_reduction = random.randint(15, 30)
+        stress_reduction = self._rng.randint(15, 30)
         self.game.data.stress_level = max(0, self.game.data.stress_level - stress_reduction)
-        mental_boost = random.randint(5, 15)
+        mental_boost = self._rng.randint(5, 15)
         self.game.data.mental_health = min(100, self.game.data.mental_health + mental_boost)
         return True, f"學習壓力管理技巧，壓力 -{stress_reduction}，心理健康 +{mental_boost}"
@@ -1,5 +1,4 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
+from types import MappingProxyType
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -10,6 +9,11 @@ class HousingSystem:
 
     def __init__(self, game: 'BankGame'):
         self.game = game
+        # 升級選項快取：{目前房屋 id: (依費用排序的選項列表, {house_id: 選項})}；房屋目錄為唯讀，不需失效
+        self._upgrades_cache = {}
+        # 家具依類別分組的索引：{category: 唯讀 {furniture_id: 家具}}，首次查詢時建立
+        self._furniture_by_category = None
+        self._furniture_source = None
 
     def can_buy_house(self, house_id):
         """檢查是否可以購買房屋"""
@@ -91,13 +95,13 @@ class HousingSystem:
             self.game.data.house_furniture[furniture_id] = 0
         self.game.data.house_furniture[furniture_id] += 1
 
-        # 更新舒適度
-        self._update_comfort_level()
+        # 更新舒適度：只加上新家具的舒適度，不必重新掃描全部家具
+        self.game.data.house_comfort_level += furniture['comfort']
 
         return True, f"成功購買 {furniture['name']}，花費 ${furniture['price']}"
 
     def _update_comfort_level(self):
-        """更新房屋舒適度"""
+        """完整重算房屋舒適度（購屋時使用；購買家具與升級改為增量更新）"""
         comfort = 0
 
         # 基礎房屋舒適度
@@ -150,16 +154,29 @@ class HousingSystem:
         }
 
     def get_furniture_by_category(self, category):
-        """按類別獲取家具"""
-        return {k: v for k, v in self.game.data.furniture_catalog.items()
-                if v['category'] == category}
+        """按類別獲取家具（回傳唯讀字典）"""
+        catalog = self.game.data.furniture_catalog
+        if self._furniture_source is not catalog:
+            buckets = {}
+            for k, v in catalog.items():
+                buckets.setdefault(v['category'], {})[k] = v
+            self._furniture_by_category = {cat: MappingProxyType(items) for cat, items in buckets.items()}
+            self._furniture_source = catalog
+        return self._furniture_by_category.get(category, MappingProxyType({}))
 
     def get_available_upgrades(self):
         """獲取可用的房屋升級選項"""
         if self.game.data.current_house is None:
             return []
+        return self._get_upgrade_options(self.game.data.current_house)[0]
+
+    def _get_upgrade_options(self, current_id):
+        """取得（並快取）指定房屋的升級選項列表與 house_id 索引"""
+        cached = self._upgrades_cache.get(current_id)
+        if cached is not None:
+            return cached
 
-        current_house = self.game.data.houses_catalog[self.game.data.current_house]
+        current_house = self.game.data.houses_catalog[current_id]
         current_price = current_house['price']
 
         # 找到更好的房屋選項
@@ -175,15 +192,17 @@ class HousingSystem:
                     'description': house['description']
                 })
 
-        return sorted(upgrades, key=lambda x: x['upgrade_cost'])
+        upgrades.sort(key=lambda x: x['upgrade_cost'])
+        cached = (upgrades, {u['house_id']: u for u in upgrades})
+        self._upgrades_cache[current_id] = cached
+        return cached
 
     def upgrade_house(self, house_id):
         """升級房屋"""
         if self.game.data.current_house is None:
             return False, "沒有房屋可升級"
 
-        upgrades = self.get_available_upgrades()
-        upgrade_info = next((u for u in upgrades if u['house_id'] == house_id), None)
+        upgrade_info = self._get_upgrade_options(self.game.data.current_house)[1].get(house_id)
 
         if not upgrade_info:
             return False, "無效的升級選項"
@@ -206,7 +225,9 @@ class HousingSystem:
 
         # 更新維護費用到期日
         self.game.data.house_maintenance_due = self.game.data.days + 30
-        self._update_comfort_level()
+        # 家具保留，只需調整房屋基礎舒適度的差額
+        new_house = self.game.data.houses_catalog[house_id]
+        self.game.data.house_comfort_level += (new_house['capacity'] - old_house['capacity']) * 5
 
         return True, f"成功升級到 {upgrade_info['name']}，花費 ${upgrade_info['upgrade_cost']:.0f}"
 
@@ -110,7 +110,8 @@ class IndustryManager:
         stock_amount_entry.pack(side=tk.LEFT, padx=5)
 
         # 取得該產業的股票列表
-        stocks_in_ind = [k for k, v in self.game.data.stocks.items() if v['industry'] == industry]
+        # 直接取產業索引，不必逐檔比對產業字串
+        stocks_in_ind = self.game.data.industry_codes.get(industry, ())
         stock_code_to_name = {k: self.game.data.stocks[k]['name'] for k in stocks_in_ind}
         
         # 股票選擇下拉選單
@@ -1,3 +1,4 @@
+import heapq
 import random
 import numpy as np
 from typing import TYPE_CHECKING
@@ -5,12 +6,44 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from bank_game import BankGame
 
+# 年化波動率係數（一年 252 個交易日）
+SQRT_252 = np.sqrt(252.0)
+
+
+def _return_stats(history, window):
+    """取最近 window 筆價格計算日報酬，回傳 (平均報酬, 報酬標準差)；價格不足兩筆時回傳 None"""
+    prices = np.asarray(history[-window:], dtype=np.float64)
+    if prices.size < 2:
+        return None
+    returns = prices[1:] / prices[:-1] - 1.0
+    return float(returns.mean()), float(returns.std())
+
+
 class InvestmentPortfolioManager:
     """投資組合管理器，提供風險評估和投資策略"""
 
     def __init__(self, game: 'BankGame'):
         self.game = game
 
+    def _owned_stocks(self):
+        """走訪持有中的股票，產生 (代碼, 股票資料, 市值)"""
+        for code, stock in self.game.data.stocks.items():
+            if stock['owned'] > 0:
+                yield code, stock, stock['price'] * stock['owned']
+
+    def _owned_funds(self):
+        """走訪持有中的基金，產生 (基金名稱, 基金資料, 市值)"""
+        for fname, fund in self.game.data.funds.items():
+            if fund['units'] > 0:
+                yield fname, fund, fund['nav'] * fund['units']
+
+    def _crypto_totals(self):
+        """回傳加密貨幣 (市值, 成本)"""
+        data = self.game.data
+        crypto_value = data.btc_balance * data.stocks['BTC']['price']
+        crypto_cost = sum(cost for cost in [getattr(data, 'btc_purchase_cost', 0)] if cost > 0)
+        return crypto_value, crypto_cost
+
     def get_portfolio_summary(self):
         """獲取投資組合總結"""
         portfolio = {
@@ -26,39 +59,35 @@ class InvestmentPortfolioManager:
         # 統計股票投資
         stock_value = 0
         stock_cost = 0
-        for code, stock in self.game.data.stocks.items():
-            if stock['owned'] > 0:
-                current_value = stock['price'] * stock['owned']
-                stock_value += current_value
-                stock_cost += stock['total_cost']
-                portfolio['stocks'][code] = {
-                    'name': stock['name'],
-                    'shares': stock['owned'],
-                    'current_price': stock['price'],
-                    'current_value': current_value,
-                    'total_cost': stock['total_cost'],
-                    'return_rate': (current_value - stock['total_cost']) / stock['total_cost'] if stock['total_cost'] > 0 else 0
-                }
+        for code, stock, current_value in self._owned_stocks():
+            stock_value += current_value
+            stock_cost += stock['total_cost']
+            portfolio['stocks'][code] = {
+                'name': stock['name'],
+                'industry': stock.get('industry', '其他'),
+                'shares': stock['owned'],
+                'current_price': stock['price'],
+                'current_value': current_value,
+                'total_cost': stock['total_cost'],
+                'return_rate': (current_value - stock['total_cost']) / stock['total_cost'] if stock['total_cost'] > 0 else 0
+            }
 
         # 統計基金投資
         fund_value = 0
         fund_cost = 0
-        for fname, fund in self.game.data.funds.items():
-            if fund['units'] > 0:
-                current_value = fund['nav'] * fund['units']
-                fund_value += current_value
-                fund_cost += fund['total_cost']
-                portfolio['funds'][fname] = {
-                    'units': fund['units'],
-                    'nav': fund['nav'],
-                    'current_value': current_value,
-                    'total_cost': fund['total_cost'],
-                    'return_rate': (current_value - fund['total_cost']) / fund['total_cost'] if fund['total_cost'] > 0 else 0
-                }
+        for fname, fund, current_value in self._owned_funds():
+            fund_value += current_value
+            fund_cost += fund['total_cost']
+            portfolio['funds'][fname] = {
+                'units': fund['units'],
+                'nav': fund['nav'],
+                'current_value': current_value,
+                'total_cost': fund['total_cost'],
+                'return_rate': (current_value - fund['total_cost']) / fund['total_cost'] if fund['total_cost'] > 0 else 0
+            }
 
         # 統計加密貨幣投資
-        crypto_value = self.game.data.btc_balance * self.game.data.stocks['BTC']['price']
-        crypto_cost = sum(cost for cost in [getattr(self.game.data, 'btc_purchase_cost', 0)] if cost > 0)
+        crypto_value, crypto_cost = self._crypto_totals()
         if self.game.data.btc_balance > 0:
             portfolio['crypto']['BTC'] = {
                 'amount': self.game.data.btc_balance,
@@ -88,9 +117,48 @@ class InvestmentPortfolioManager:
 
         return portfolio
 
-    def assess_portfolio_risk(self):
-        """評估投資組合風險"""
-        portfolio = self.get_portfolio_summary()
+    def get_portfolio_aggregates(self):
+        """風險評估所需的精簡彙總：持股代碼、產業、市值三個平行陣列，以及 BTC 市值與總市值"""
+        codes = []
+        industries = []
+        values = []
+        for code, stock, current_value in self._owned_stocks():
+            codes.append(code)
+            industries.append(stock.get('industry', '其他'))
+            values.append(current_value)
+        fund_value = sum(current_value for _, _, current_value in self._owned_funds())
+        crypto_value, _ = self._crypto_totals()
+        return {
+            'codes': codes,
+            'industries': industries,
+            'values': values,
+            'btc_value': crypto_value if self.game.data.btc_balance > 0 else 0.0,
+            'total_value': sum(values) + fund_value + crypto_value,
+        }
+
+    @staticmethod
+    def _aggregates_from_summary(portfolio):
+        """由 get_portfolio_summary() 的結果取出與 get_portfolio_aggregates() 相同格式的彙總"""
+        stocks = portfolio['stocks']
+        crypto = portfolio['crypto'].get('BTC')
+        return {
+            'codes': list(stocks),
+            'industries': [stock['industry'] for stock in stocks.values()],
+            'values': [stock['current_value'] for stock in stocks.values()],
+            'btc_value': crypto['current_value'] if crypto else 0.0,
+            'total_value': portfolio['total_value'],
+        }
+
+    def assess_portfolio_risk(self, portfolio=None):
+        """評估投資組合風險；呼叫端已有同一時點的 get_portfolio_summary() 結果時可直接傳入，
+        否則只計算風險所需的彙總，不建立完整摘要"""
+        if portfolio is None:
+            agg = self.get_portfolio_aggregates()
+        else:
+            agg = self._aggregates_from_summary(portfolio)
+        codes = agg['codes']
+        values = agg['values']
+        total_value = agg['total_value']
 
         risk_metrics = {
             'volatility': 0,
@@ -102,40 +170,32 @@ class InvestmentPortfolioManager:
         }
 
         # 計算波動性風險
-        if portfolio['stocks']:
+        if codes:
             volatilities = []
-            for stock_data in portfolio['stocks'].values():
+            stocks = self.game.data.stocks
+            for code in codes:
                 # 估計波動性（基於價格變化）
-                if len(self.game.data.stocks[stock_data['name']]['history']) > 10:
-                    history = self.game.data.stocks[stock_data['name']]['history'][-10:]
-                    returns = [history[i+1]/history[i] - 1 for i in range(len(history)-1)]
-                    volatility = np.std(returns) * np.sqrt(252) if returns else 0
-                    volatilities.append(volatility)
+                history = stocks[code]['history']
+                if len(history) > 10:
+                    volatilities.append(_return_stats(history, 10)[1] * SQRT_252)
 
             risk_metrics['volatility'] = np.mean(volatilities) if volatilities else 0
 
         # 計算集中風險
-        if portfolio['stocks']:
-            max_allocation = max(stock['current_value'] for stock in portfolio['stocks'].values())
-            risk_metrics['concentration_risk'] = (max_allocation / portfolio['total_value']) * 100
+        if values:
+            risk_metrics['concentration_risk'] = (max(values) / total_value) * 100
 
         # 計算行業風險
         sector_allocation = {}
-        for stock_data in portfolio['stocks'].values():
-            stock_info = next((s for s in self.game.data.stocks.values() if s['name'] == stock_data['name']), None)
-            if stock_info:
-                sector = stock_info.get('industry', '其他')
-                if sector not in sector_allocation:
-                    sector_allocation[sector] = 0
-                sector_allocation[sector] += stock_data['current_value']
+        for sector, value in zip(agg['industries'], values):
+            sector_allocation[sector] = sector_allocation.get(sector, 0) + value
 
         if sector_allocation:
             max_sector_allocation = max(sector_allocation.values())
-            risk_metrics['sector_risk'] = (max_sector_allocation / portfolio['total_value']) * 100
+            risk_metrics['sector_risk'] = (max_sector_allocation / total_value) * 100
 
         # 計算流動性風險
-        illiquid_assets = crypto_value = self.game.data.btc_balance * self.game.data.stocks['BTC']['price']
-        risk_metrics['liquidity_risk'] = (illiquid_assets / portfolio['total_value']) * 100 if portfolio['total_value'] > 0 else 0
+        risk_metrics['liquidity_risk'] = (agg['btc_value'] / total_value) * 100 if total_value > 0 else 0
 
         # 計算整體風險
         risk_score = (
@@ -162,7 +222,7 @@ class InvestmentPortfolioManager:
     def get_investment_recommendations(self):
         """獲取投資建議"""
         portfolio = self.get_portfolio_summary()
-        risk_metrics = self.assess_portfolio_risk()
+        risk_metrics = self.assess_portfolio_risk(portfolio)
 
         recommendations = []
 
@@ -229,13 +289,25 @@ class InvestmentPortfolioManager:
             'recommendations': []
         }
 
-        # 分析市場情緒
+        # 單次走訪所有股票，同時累計市場報酬、產業表現與近期波動
         market_return = 0
+        sector_performance = {}
+        recent_volatility = []
         for stock in self.game.data.stocks.values():
-            if len(stock['history']) >= 2:
-                recent_return = (stock['price'] - stock['history'][-2]) / stock['history'][-2]
-                market_return += recent_return
+            history = stock['history']
+            price = stock['price']
+            n = len(history)
+            if n >= 2:
+                market_return += (price - history[-2]) / history[-2]
+
+            performances = sector_performance.setdefault(stock.get('industry', '其他'), [])
+            if n >= 5:
+                performances.append((price - history[-5]) / history[-5])
+
+            if n >= 10:
+                recent_volatility.append(_return_stats(history, 10)[1])
 
+        # 分析市場情緒
         avg_market_return = market_return / len(self.game.data.stocks)
         if avg_market_return > 0.05:
             trends['market_sentiment'] = 'bullish'
@@ -243,16 +315,6 @@ class InvestmentPortfolioManager:
             trends['market_sentiment'] = 'bearish'
 
         # 分析熱門行業
-        sector_performance = {}
-        for stock in self.game.data.stocks.values():
-            sector = stock.get('industry', '其他')
-            if sector not in sector_performance:
-                sector_performance[sector] = []
-
-            if len(stock['history']) >= 5:
-                recent_performance = (stock['price'] - stock['history'][-5]) / stock['history'][-5]
-                sector_performance[sector].append(recent_performance)
-
         for sector, performances in sector_performance.items():
             if performances:
                 avg_performance = sum(performances) / len(performances)
@@ -262,15 +324,6 @@ class InvestmentPortfolioManager:
                     trends['cold_sectors'].append(sector)
 
         # 預測波動性
-        recent_volatility = []
-        for stock in self.game.data.stocks.values():
-            if len(stock['history']) >= 10:
-                prices = stock['history'][-10:]
-                returns = [prices[i+1]/prices[i] - 1 for i in range(len(prices)-1)]
-                if returns:
-                    volatility = np.std(returns)
-                    recent_volatility.append(volatility)
-
         if recent_volatility:
             avg_volatility = sum(recent_volatility) / len(recent_volatility)
             if avg_volatility > 0.03:
@@ -295,7 +348,7 @@ class InvestmentPortfolioManager:
     def generate_investment_strategy(self):
         """生成投資策略建議"""
         portfolio = self.get_portfolio_summary()
-        risk_metrics = self.assess_portfolio_risk()
+        risk_metrics = self.assess_portfolio_risk(portfolio)
         market_trends = self.analyze_market_trends()
 
         strategy = {
@@ -372,20 +425,16 @@ class InvestmentPortfolioManager:
         # 收集可用資產
         for code, stock in self.game.data.stocks.items():
             if len(stock['history']) >= 30:
-                returns = []
-                for i in range(1, min(30, len(stock['history']))):
-                    ret = (stock['history'][-i] - stock['history'][-i-1]) / stock['history'][-i-1]
-                    returns.append(ret)
-
-                if returns:
-                    asset = {
-                        'code': code,
-                        'name': stock['name'],
-                        'expected_return': sum(returns) / len(returns),
-                        'risk': np.std(returns),
-                        'price': stock['price']
-                    }
-                    available_assets.append(asset)
+                # 最近 30 筆價格的 29 個日報酬
+                mean_return, risk = _return_stats(stock['history'], 30)
+                asset = {
+                    'code': code,
+                    'name': stock['name'],
+                    'expected_return': mean_return,
+                    'risk': risk,
+                    'price': stock['price']
+                }
+                available_assets.append(asset)
 
         if len(available_assets) < 2:
             return None
@@ -397,11 +446,11 @@ class InvestmentPortfolioManager:
         if max_risk is None:
             max_risk = 0.1  # 預設最大風險
 
-        # 選擇風險最低的資產作為基礎
-        sorted_assets = sorted(available_assets, key=lambda x: x['risk'])
+        # 選擇風險最低的前 5 個資產作為基礎（只取前 5 名，不需整體排序）
+        sorted_assets = heapq.nsmallest(5, available_assets, key=lambda x: x['risk'])
 
         total_weight = 0
-        for i, asset in enumerate(sorted_assets[:5]):  # 選擇前5個最低風險資產
+        for i, asset in enumerate(sorted_assets):
             if asset['risk'] <= max_risk:
                 weight = 1 / (i + 1)  # 簡單權重分配
                 optimal_portfolio[asset['code']] = {
@@ -10,49 +10,59 @@ if TYPE_CHECKING:
 class JobManager:
     def __init__(self, game: 'BankGame'):
         self.game = game
+        # 各職業標籤上次設定的 (widget, text)，文字未變時略過 config 以免重繪
+        self._last_job_text = {}
 
     # --- UI ---
     def update_job_ui(self):
         g = self.game
+        if not hasattr(g, 'job_labels'):
+            return
         try:
-            if hasattr(g, 'job_labels'):
-                job = getattr(g.data, 'job', None)
-                # 共同資訊：公司與學歷（若有對應的標籤）
-                comp_name = getattr(g.data, 'current_company', '一般公司')
-                comp_mult = float(getattr(g.data, 'companies_catalog', {}).get(comp_name, {}).get('salary_multiplier', 1.0))
-                edu_level = getattr(g.data, 'education_level', '高中')
-                edu_mult = float(getattr(g.data, 'education_multipliers', {}).get(edu_level, 1.0))
-                # 若進修中，顯示預計完成日
-                edu_suffix = ""
-                try:
-                    sip = getattr(g.data, 'study_in_progress', None)
-                    if isinstance(sip, dict):
-                        finish_day = int(sip.get('finish_day', 0))
-                        target = str(sip.get('target', ''))
-                        if target:
-                            edu_suffix = f"（進修中→{target}，預計第 {finish_day} 天完成）"
-                except Exception:
-                    pass
-                if job:
-                    g.job_labels['name'].config(text=f"職稱：{job.get('name','-')}")
-                    g.job_labels['level'].config(text=f"等級：{job.get('level',1)}")
-                    g.job_labels['salary'].config(text=f"日薪：${job.get('salary_per_day',0.0):.2f}")
-                    g.job_labels['tax'].config(text=f"稅率：{job.get('tax_rate',0.0)*100:.1f}%")
-                    g.job_labels['next'].config(text=f"下次升職日：第 {job.get('next_promotion_day','-')} 天")
-                    if 'company' in g.job_labels:
-                        g.job_labels['company'].config(text=f"公司：{comp_name}（x{comp_mult:.2f}）")
-                    if 'education' in g.job_labels:
-                        g.job_labels['education'].config(text=f"學歷：{edu_level}（x{edu_mult:.2f}）{edu_suffix}")
-                else:
-                    g.job_labels['name'].config(text="職稱：未就業")
-                    g.job_labels['level'].config(text="等級：-")
-                    g.job_labels['salary'].config(text="日薪：$0.00")
-                    g.job_labels['tax'].config(text="稅率：0.0%")
-                    g.job_labels['next'].config(text="下次升職日：-")
-                    if 'company' in g.job_labels:
-                        g.job_labels['company'].config(text=f"公司：{comp_name}（x{comp_mult:.2f}）")
-                    if 'education' in g.job_labels:
-                        g.job_labels['education'].config(text=f"學歷：{edu_level}（x{edu_mult:.2f}）{edu_suffix}")
+            data = g.data
+            labels = g.job_labels
+            last = self._last_job_text
+
+            def _set(key, text):
+                label = labels[key]
+                if last.get(key) != (label, text):
+                    label.config(text=text)
+                    last[key] = (label, text)
+
+            job = getattr(data, 'job', None)
+            # 共同資訊：公司與學歷（若有對應的標籤）
+            comp_name = getattr(data, 'current_company', '一般公司')
+            comps = getattr(data, 'companies_catalog', None) or {}
+            comp_mult = float((comps.get(comp_name) or {}).get('salary_multiplier', 1.0))
+            edu_level = getattr(data, 'education_level', '高中')
+            edu_mult = float((getattr(data, 'education_multipliers', None) or {}).get(edu_level, 1.0))
+            # 若進修中，顯示預計完成日
+            edu_suffix = ""
+            try:
+                sip = getattr(data, 'study_in_progress', None)
+                if isinstance(sip, dict):
+                    finish_day = int(sip.get('finish_day', 0))
+                    target = str(sip.get('target', ''))
+                    if target:
+                        edu_suffix = f"（進修中→{target}，預計第 {finish_day} 天完成）"
+            except Exception:
+                pass
+            if job:
+                _set('name', f"職稱：{job.get('name','-')}")
+                _set('level', f"等級：{job.get('level',1)}")
+                _set('salary', f"日薪：${job.get('salary_per_day',0.0):.2f}")
+                _set('tax', f"稅率：{job.get('tax_rate',0.0)*100:.1f}%")
+                _set('next', f"下次升職日：第 {job.get('next_promotion_day','-')} 天")
+            else:
+                _set('name', "職稱：未就業")
+                _set('level', "等級：-")
+                _set('salary', "日薪：$0.00")
+                _set('tax', "稅率：0.0%")
+                _set('next', "下次升職日：-")
+            if 'company' in labels:
+                _set('company', f"公司：{comp_name}（x{comp_mult:.2f}）")
+            if 'education' in labels:
+                _set('education', f"學歷：{edu_level}（x{edu_mult:.2f}）{edu_suffix}")
         except Exception:
             pass
 
@@ -87,8 +97,7 @@ class JobManager:
         }
         g.log_transaction(f"已選擇工作：{name}，日薪 ${g.data.job['salary_per_day']:.2f}")
         self.update_job_ui()
-        g._pending_save = True
-        g.schedule_persist()
+        g.request_save()
 
     def promote_job(self):
         g = self.game
@@ -157,10 +166,8 @@ class JobManager:
                 g.show_event_message(f"升職失敗！\\n請再接再厲，下次嘗試需等待 {fail_cd} 天\\n成功機率：{success_rate*100:.1f}%")
 
             self.update_job_ui()
-            if hasattr(g, '_pending_save'):
-                g._pending_save = True
-            if hasattr(g, 'schedule_persist'):
-                g.schedule_persist()
+            if hasattr(g, 'request_save'):
+                g.request_save()
 
         except Exception as e:
             # 處理計算過程中的錯誤
@@ -239,8 +246,7 @@ class JobManager:
         mult = float(cats[name].get('salary_multiplier', 1.0))
         g.log_transaction(f"加入公司：{name}（薪資倍率 x{mult:.2f}）")
         self.update_job_ui()
-        g._pending_save = True
-        g.schedule_persist()
+        g.request_save()
         return True
 
     # --- 進修升學：學歷越高薪水越高 ---
@@ -288,6 +294,5 @@ class JobManager:
         g.log_transaction(f"開始進修：目標 {next_level}，需時 {study_days} 天（基礎{base_days}天，屬性加速 x{(base_days/max(study_days,1)):.2f}），預計第 {finish_day} 天完成，花費 ${need:.2f}")
         g.show_event_message(f"已開始進修（{next_level}），需時 {study_days} 天！")
         self.update_job_ui()
-        g._pending_save = True
-        g.schedule_persist()
+        g.request_save()
         return True
@@ -24,7 +24,7 @@ class GameLogger:
         g = self.game
         try:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            g.data.transaction_history.append({'timestamp': timestamp, 'message': message})
+            g.data.record_log('transaction_history', {'timestamp': timestamp, 'message': message})
             # 更新歷史訊息視窗（若存在）
             if hasattr(g, 'history_text') and g.history_text is not None:
                 g.history_text.config(state='normal')
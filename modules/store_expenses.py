@@ -13,6 +13,12 @@ class StoreExpensesManager:
 
     # --- 共用小工具：集中重複邏輯 ---
     FREQ_DAYS = {'daily': 1, 'weekly': 7, 'monthly': 30}
+    # 訂閱全額扣款成功時的屬性影響
+    SUBSCRIPTION_EFFECTS = {
+        'Netflix 訂閱': {'happiness': 3},
+        'Spotify 訂閱': {'happiness': 2},
+        '健身房會員': {'stamina': 4, 'happiness': 1},
+    }
 
     def _freq_interval(self, frequency: str, default: int = 30) -> int:
         return self.FREQ_DAYS.get(frequency, default)
@@ -47,8 +53,7 @@ class StoreExpensesManager:
                 self.update_store_ui()
             if update_display:
                 g.update_display()
-            g._pending_save = True
-            g.schedule_persist()
+            g.request_save()
         except Exception as e:
             g.debug_log(f"_refresh_and_persist error: {e}")
 
@@ -236,10 +241,6 @@ class StoreExpensesManager:
             if not hasattr(g.data, 'inventory') or not isinstance(g.data.inventory, dict):
                 g.data.inventory = {}
             
-            # 確保 consumables 存在
-            if not hasattr(g.data, 'consumables') or not isinstance(g.data.consumables, dict):
-                g.data.consumables = {}
-            
             # 更新商店物品清單（包含消耗品）
             goods_rows = []
             
@@ -252,7 +253,7 @@ class StoreExpensesManager:
             for item_id, item in getattr(g.data, 'consumables', {}).items():
                 name = item.get('name', '未知物品')
                 price = float(item.get('price', 0.0))
-                daily_left = max(0, item.get('daily_limit', 1) - item.get('daily_bought', 0))
+                daily_left = max(0, item.get('daily_limit', 1) - g.data.get_daily_bought(item_id))
                 goods_rows.append(f"{name} | ${price:.2f} (今日剩餘: {daily_left}/{item.get('daily_limit', 1)})")
             
             self._populate_listbox('store_goods_list', goods_rows)
@@ -333,7 +334,7 @@ class StoreExpensesManager:
             # 檢查每日限購
             if is_consumable:
                 item = g.data.consumables[item_id]
-                if item['daily_bought'] >= item['daily_limit']:
+                if g.data.get_daily_bought(item_id) >= item['daily_limit']:
                     g.log_transaction(f"購買失敗（今日已達限購數量）：{name}")
                     return False
                 
@@ -343,27 +344,20 @@ class StoreExpensesManager:
             # 處理消耗品
             if is_consumable:
                 # 更新已購買數量
-                g.data.consumables[item_id]['daily_bought'] += 1
+                g.data.consumable_state.setdefault(item_id, {'daily_bought': 0})['daily_bought'] += 1
                 # 添加到庫存
-                if item_id not in g.data.inventory:
-                    g.data.inventory[item_id] = 0
-                g.data.inventory[item_id] += 1
+                g.data.add_item(item_id)
                 g.log_transaction(f"購買消耗品：{name} x1 花費 ${price:.2f}")
             else:
                 # 舊版物品處理（相容性）
-                if not hasattr(g.data, 'inventory'):
-                    g.data.inventory = {}
-                if name not in g.data.inventory:
-                    g.data.inventory[name] = 0
-                g.data.inventory[name] += 1
+                g.data.add_item(name)
                 g.log_transaction(f"購買物品：{name} 花費 ${price:.2f}")
             
             # 更新UI和存檔
             if hasattr(self, 'update_store_ui'):
                 self.update_store_ui()
             g.update_display()
-            g._pending_save = True
-            g.schedule_persist()
+            g.request_save()
             return True
         except Exception as e:
             g.debug_log(f"buy_store_good error: {e}")
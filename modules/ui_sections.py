@@ -479,7 +479,7 @@ def create_main_tabs(root, game):
     # 新增：產業分頁，虛擬貨幣分頁不再顯示在這裡
     from industry_manager import IndustryManager
     
-    industries = list({stock['industry'] for stock in game.data.stocks.values() if stock['industry'] != '虛擬貨幣'})
+    industries = [ind for ind in game.data.industry_codes if ind != '虛擬貨幣']
     industry_tabs = ttk.Notebook(chart_tab)
     industry_tabs.pack(fill=tk.BOTH, expand=True)
     game.industry_tabs = industry_tabs
@@ -1,9 +1,8 @@
 import os
-import json
 import sqlite3
 import logging
 from typing import Dict, Any, Optional, Union
-from game_data import GameData
+from game_data import GameData, _dumps, _loads, _read_save_file
 
 
 class UnifiedDataManager:
@@ -82,7 +81,8 @@ class UnifiedDataManager:
         try:
             # 序列化GameData為JSON
             data_dict = self._serialize_game_data(game_data)
-            data_json = json.dumps(data_dict, ensure_ascii=False, indent=2, default=str)
+            # 只編碼一次，資料庫與 JSON 檔共用同一份（有 orjson 時使用 orjson）
+            data_json = _dumps(data_dict, pretty=True).decode('utf-8')
 
             # 同時儲存到資料庫
             conn = sqlite3.connect(self.db_path)
@@ -100,7 +100,7 @@ class UnifiedDataManager:
             # 同時儲存為JSON檔案（向後相容）
             json_path = os.path.join(self.json_save_dir, f'save_{username}_{save_name}.json')
             with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data_dict, f, ensure_ascii=False, indent=2, default=str)
+                f.write(data_json)
 
             return True
 
@@ -143,7 +143,7 @@ class UnifiedDataManager:
             conn.close()
 
             if row:
-                data_dict = json.loads(row[0])
+                data_dict = _loads(row[0])
                 game_data = self._deserialize_game_data(data_dict)
                 return game_data
 
@@ -251,13 +251,14 @@ class UnifiedDataManager:
     def _serialize_game_data(self, game_data: GameData) -> Dict[str, Any]:
         """序列化GameData對象，排除無法序列化的屬性"""
         data = {}
+        skip = GameData._TRANSIENT_KEYS | GameData._STATIC_KEYS
         for key, value in game_data.__dict__.items():
-            # 排除無法序列化的物件
-            if key in ['achievements_manager']:
+            # 排除無法序列化的物件與可由 reset() 重建的靜態目錄
+            if key in skip:
                 continue
             # 將複雜物件轉換為可序列化格式
             try:
-                json.dumps(value, default=str)
+                _dumps(value)
                 data[key] = value
             except (TypeError, ValueError):
                 logging.warning(f"跳過無法序列化的屬性: {key}")
@@ -267,17 +268,13 @@ class UnifiedDataManager:
     def _deserialize_game_data(self, data_dict: Dict[str, Any]) -> GameData:
         """反序列化為GameData對象"""
         game_data = GameData()
-        game_data.__dict__.update(data_dict)
+        game_data.apply_save_data(data_dict)
         return game_data
 
     def _load_from_json_file(self, file_path: str) -> Optional[GameData]:
-        """從JSON檔案載入GameData"""
+        """從存檔檔案載入GameData（gzip、MessagePack 與舊版純 JSON 皆可）"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            game_data = GameData()
-            game_data.__dict__.update(data)
-            return game_data
+            return self._deserialize_game_data(_read_save_file(file_path))
         except Exception as e:
             logging.error(f"從JSON檔案載入失敗: {e}")
             return None
@@ -302,8 +299,8 @@ class UnifiedDataManager:
                 return False
 
             data_dict = self._serialize_game_data(game_data)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data_dict, f, ensure_ascii=False, indent=2, default=str)
+            with open(output_path, 'wb') as f:
+                f.write(_dumps(data_dict, pretty=True))
             return True
 
         except Exception as e:
@@ -78,6 +78,12 @@ def test_json_data_integrity():
         log("FAIL: saves/ 目錄不存在")
         return False
 
+    # 存檔可能是 gzip 壓縮或 MessagePack，沿用遊戲本身的讀檔邏輯
+    modules_dir = os.path.join(os.path.dirname(__file__), 'modules')
+    if modules_dir not in sys.path:
+        sys.path.insert(0, modules_dir)
+    from game_data import _read_save_file
+
     save_files = [f for f in os.listdir(saves_dir) if f.endswith('.json')]
     if not save_files:
         log("WARN: 沒有找到存檔檔案")
@@ -87,8 +93,7 @@ def test_json_data_integrity():
     for save_file in save_files:
         file_path = os.path.join(saves_dir, save_file)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_save_file(file_path)
 
             required_fields = ['cash', 'days', 'stocks']
             missing_fields = [field for field in required_fields if field not in data]
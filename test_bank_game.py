@@ -35,6 +35,178 @@ def test_bank_game_import():
         print(f"❌ 其他錯誤：{e}")
         return False
 
+def _load_game_data_module():
+    """匯入 modules/game_data.py"""
+    modules_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'modules')
+    if modules_dir not in sys.path:
+        sys.path.insert(0, modules_dir)
+    import game_data
+    return game_data
+
+
+def _assert_save_roundtrip(game_data, path, **save_kwargs):
+    """存檔後以新的 GameData 讀回，確認動態欄位一致"""
+    data = game_data.GameData()
+    data.cash = 4321
+    data.days = 17
+    data.stocks['TSMC']['owned'] = 5
+    assert data.save(path, **save_kwargs)
+    assert not os.path.exists(path + '.tmp')
+
+    loaded = game_data.GameData()
+    loaded.load(path)
+    assert loaded.cash == 4321
+    assert loaded.days == 17
+    assert loaded.stocks['TSMC']['owned'] == 5
+    return loaded
+
+
+def test_game_data_save_roundtrip(tmp_path):
+    """預設存檔為 gzip 壓縮的 JSON，可完整讀回"""
+    game_data = _load_game_data_module()
+    path = str(tmp_path / 'save.json')
+    _assert_save_roundtrip(game_data, path)
+    with open(path, 'rb') as f:
+        assert f.read(2) == game_data.GZIP_MAGIC
+
+
+def test_game_data_durable_save_roundtrip(tmp_path):
+    """durable=True（關閉遊戲時的存檔）同樣可完整讀回"""
+    game_data = _load_game_data_module()
+    _assert_save_roundtrip(game_data, str(tmp_path / 'save.json'), durable=True)
+
+
+def test_game_data_binary_save_roundtrip(tmp_path):
+    """.msave 存檔以 MessagePack 寫入並可讀回"""
+    game_data = _load_game_data_module()
+    if game_data.msgpack is None:
+        import pytest
+        pytest.skip('未安裝 msgpack')
+    _assert_save_roundtrip(game_data, str(tmp_path / ('save' + game_data.BINARY_SAVE_EXT)))
+
+
+def test_unified_import_reads_compressed_save(tmp_path):
+    """GameData.save 寫出的 gzip 存檔可由 UnifiedDataManager.import_from_json 匯入"""
+    game_data = _load_game_data_module()
+    from unified_data_manager import UnifiedDataManager
+
+    path = str(tmp_path / 'save_tester.json')
+    data = game_data.GameData()
+    data.cash = 2468
+    data.stocks['MTK']['owned'] = 3
+    assert data.save(path)
+
+    manager = UnifiedDataManager(db_path=str(tmp_path / 'app.db'), json_save_dir=str(tmp_path / 'saves'))
+    assert manager.import_from_json(path, 'tester', 'default')
+    loaded = manager.load_game_data('tester', 'default')
+    assert loaded is not None
+    assert loaded.cash == 2468
+    assert loaded.stocks['MTK']['owned'] == 3
+
+
+def test_dumps_keeps_numeric_subclasses_numeric():
+    """float / int 子類別（如 numpy.float64）不論是否安裝 orjson 都存成數值"""
+    game_data = _load_game_data_module()
+
+    class Price(float):
+        pass
+
+    class Count(int):
+        pass
+
+    assert game_data._loads(game_data._dumps({'a': Price(1.5), 'b': Count(3)})) == {'a': 1.5, 'b': 3}
+
+
+def test_record_price_trims_history_and_shifts_trade_points():
+    """價格歷史超過兩倍上限時裁切回上限，買賣點索引跟著位移、仍指向同一筆價格"""
+    game_data = _load_game_data_module()
+    limit = game_data.MAX_PRICE_HISTORY
+    data = game_data.GameData()
+    stock = data.stocks['TSMC']
+
+    for i in range(3 * limit):
+        data.record_price(stock, 1000.0 + i)
+        idx = len(stock['history']) - 1
+        if i % 7 == 0:
+            stock['buy_points'].append((idx, stock['price']))
+        if i % 11 == 0:
+            stock['sell_points'].append((idx, stock['price']))
+        assert len(stock['history']) <= 2 * limit
+
+    history = stock['history']
+    assert history[-1] == stock['price'] == 1000.0 + 3 * limit - 1
+    # 價格遞增且不重複，索引正確時買賣點價格必與歷史中該位置相同
+    for key in ('buy_points', 'sell_points'):
+        assert stock[key]
+        for idx, price in stock[key]:
+            assert 0 <= idx < len(history)
+            assert history[idx] == price
+    # 被裁掉的舊價格，其買賣點也一併移除
+    assert min(price for _, price in stock['buy_points']) >= history[0]
+
+    data.trim_histories()
+    assert len(history) == limit
+    for key in ('buy_points', 'sell_points'):
+        for idx, price in stock[key]:
+            assert history[idx] == price
+
+
+def test_record_log_stays_bounded():
+    """歷史紀錄在兩次存檔之間不超過兩倍上限，存檔前裁切回上限並保留最新項目"""
+    game_data = _load_game_data_module()
+    limit = game_data.MAX_LOG_HISTORY
+    data = game_data.GameData()
+
+    for i in range(3 * limit):
+        data.record_log('transaction_history', i)
+        assert len(data.transaction_history) <= 2 * limit
+    assert data.transaction_history[-1] == 3 * limit - 1
+
+    data.trim_histories()
+    assert len(data.transaction_history) == limit
+    assert data.transaction_history == list(range(2 * limit, 3 * limit))
+
+
+def test_load_migrates_old_consumable_counts(tmp_path):
+    """舊版存檔把 daily_bought 放在消耗品定義裡、沒有 consumable_state，讀檔後搬到 consumable_state"""
+    game_data = _load_game_data_module()
+    payload = game_data.GameData()._save_payload()
+    payload.pop('consumable_state')
+    payload['consumables'] = {
+        'energy_drink': {'name': '能量飲料', 'price': 50, 'daily_bought': 2},
+        'study_kit': {'name': '學習套組', 'price': 100, 'daily_bought': 1},
+    }
+    path = tmp_path / 'old_save.json'
+    path.write_bytes(game_data._dumps(payload))
+
+    data = game_data.GameData()
+    data.load(str(path))
+    assert data.consumable_state == {
+        'energy_drink': {'daily_bought': 2},
+        'study_kit': {'daily_bought': 1},
+        'social_card': {'daily_bought': 0},
+    }
+    assert data.get_daily_bought('energy_drink') == 2
+    # 消耗品定義仍是類別上的唯讀目錄，不採用存檔中的舊定義
+    assert 'consumables' not in vars(data)
+    assert data.consumables is game_data.GameData.consumables
+
+
+def test_load_falls_back_on_invalid_numeric_fields():
+    """數值欄位是 None 或非數字字串時改用預設值，其餘欄位照常讀入"""
+    game_data = _load_game_data_module()
+    payload = game_data.GameData()._save_payload()
+    payload.update({'cash': None, 'loan': 'abc', 'balance': 12, 'days': 9})
+
+    data = game_data.GameData()
+    data.apply_save_data(payload)
+    defaults = game_data.GameData()
+    assert data.cash == float(defaults.cash)
+    assert data.loan == float(defaults.loan)
+    assert data.balance == 12.0 and isinstance(data.balance, float)
+    assert data.days == 9
+
+
 if __name__ == "__main__":
     print("🔍 測試 bank_game 模組載入...")
     success = test_bank_game_import()